@@ -0,0 +1,72 @@
+"""
+Compressed input benchmark for the String Calculator.
+
+Compares decompressing a whole file before calling add with the pipelined
+add_file reader, for every stdlib codec, in time and peak Python memory:
+
+    python benchmarks/bench_compressed.py [num_tokens]
+"""
+import bz2
+import gzip
+import lzma
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from string_calculator.string_calculator import StringCalculator  # noqa: E402
+from string_calculator.workload import WorkloadSpec, generate_workload  # noqa: E402
+
+CODECS = {'gzip': gzip, 'bz2': bz2, 'xz': lzma}
+
+
+def measure(function):
+    """Return the result, wall time and peak traced memory of a function."""
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    # Tracing slows allocations down, so memory is measured in a separate run
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    """Print the throughput and peak memory of both approaches."""
+    num_tokens = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    input_str = generate_workload(WorkloadSpec('multiple', num_tokens=num_tokens,
+                                               over_limit_density=0.1))
+    size_mb = len(input_str) / 1e6
+    calculator = StringCalculator()
+
+    print(f"{size_mb:.1f} MB of input")
+    print(f"{'codec':>6} {'approach':>22} {'time':>8} {'MB/s':>8} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, codec in CODECS.items():
+            path = os.path.join(directory, 'input.' + name)
+            with codec.open(path, 'wt', encoding='utf-8', newline='') as output:
+                output.write(input_str)
+
+            def decompress_then_add():
+                with codec.open(path, 'rt', encoding='utf-8', newline='') as input_file:
+                    return calculator.add(input_file.read())
+
+            runs = (('decompress-then-add', decompress_then_add),
+                    ('pipelined add_file', lambda: calculator.add_file(path)))
+            results = set()
+            for approach, function in runs:
+                result, elapsed, peak = measure(function)
+                results.add(result)
+                print(f"{name:>6} {approach:>22} {elapsed:>7.2f}s "
+                      f"{size_mb / elapsed:>8.1f} {peak / 1e6:>8.1f}")
+            assert len(results) == 1, results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Thread scaling benchmark for the String Calculator.
+
+Measures add_many and the threaded parallel engine from 1 to N threads.
+Run it on a regular and on a free-threaded interpreter (e.g. python3.13t)
+to compare scaling with and without the GIL:
+
+    python benchmarks/bench_threads.py [max_threads]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from string_calculator.engines import gil_enabled, parallel_sum  # noqa: E402
+from string_calculator.string_calculator import StringCalculator  # noqa: E402
+from string_calculator.workload import WorkloadSpec, generate_workload  # noqa: E402
+
+
+def best_time(function, repeat=3):
+    """Return the best wall time of several runs of a function."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    """Print the throughput of every thread count."""
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else (os.cpu_count() or 1)
+    calculator = StringCalculator()
+    many_inputs = [generate_workload(WorkloadSpec('multiple', num_tokens=2000, seed=seed))
+                   for seed in range(64)]
+    large_body = generate_workload(WorkloadSpec(num_tokens=2_000_000))
+
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil_enabled() else 'disabled'}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'threads':>7} {'add_many':>12} {'speedup':>8} {'large input':>12} {'speedup':>8}")
+    base_many = base_large = None
+    threads = 1
+    while threads <= max_threads:
+        many = best_time(lambda: calculator.add_many(many_inputs, max_workers=threads))
+        large = best_time(lambda: parallel_sum(large_body, ',', workers=threads, use_threads=True))
+        base_many = base_many or many
+        base_large = base_large or large
+        print(f"{threads:>7} {many:>11.3f}s {base_many / many:>7.2f}x "
+              f"{large:>11.3f}s {base_large / large:>7.2f}x")
+        threads *= 2
+
+
+if __name__ == "__main__":
+    main()
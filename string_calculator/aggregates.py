@@ -0,0 +1,100 @@
+"""
+Aggregates for the String Calculator.
+
+This module computes several statistics of the numbers of an input in a
+single pass, so that an input only has to be parsed once.
+"""
+from typing import Dict, Iterable, List, Sequence
+
+SUM = 'sum'
+COUNT = 'count'
+MIN = 'min'
+MAX = 'max'
+MEAN = 'mean'
+HISTOGRAM = 'histogram'
+
+AGGREGATES = (SUM, COUNT, MIN, MAX, MEAN, HISTOGRAM)
+
+
+class Aggregator:
+    """
+    Accumulates the requested aggregates over batches of numbers.
+    """
+
+    def __init__(self, ops: Sequence[str] = (SUM,), bucket_width: int = 100):
+        """
+        Initialize the aggregator.
+
+        Args:
+            ops (Sequence[str], optional): The aggregates to compute, among AGGREGATES.
+                Defaults to ('sum',).
+            bucket_width (int, optional): The width of the histogram buckets. Defaults to 100.
+
+        Raises:
+            ValueError: If an aggregate is unknown or the bucket width is not positive.
+        """
+        unknown = [op for op in ops if op not in AGGREGATES]
+        if unknown:
+            raise ValueError(f"unknown aggregates: {', '.join(unknown)}")
+        if bucket_width <= 0:
+            raise ValueError("bucket_width must be positive")
+
+        self.ops = list(ops)
+        self.bucket_width = bucket_width
+        self.total = 0
+        self.count = 0
+        self.minimum = None
+        self.maximum = None
+        self.buckets: Dict[int, int] = {}
+
+    def update(self, numbers: List[int]) -> None:
+        """
+        Add a batch of numbers to the aggregates.
+
+        Args:
+            numbers (List[int]): The numbers, already validated and filtered.
+        """
+        if not numbers:
+            return
+        self.total += sum(numbers)
+        self.count += len(numbers)
+        if MIN in self.ops or MAX in self.ops:
+            batch_min, batch_max = min(numbers), max(numbers)
+            self.minimum = batch_min if self.minimum is None else min(self.minimum, batch_min)
+            self.maximum = batch_max if self.maximum is None else max(self.maximum, batch_max)
+        if HISTOGRAM in self.ops:
+            buckets = self.buckets
+            width = self.bucket_width
+            for num in numbers:
+                bucket = num - num % width
+                buckets[bucket] = buckets.get(bucket, 0) + 1
+
+    def update_all(self, batches: Iterable[List[int]]) -> None:
+        """
+        Add several batches of numbers to the aggregates.
+
+        Args:
+            batches (Iterable[List[int]]): The batches of numbers.
+        """
+        for numbers in batches:
+            self.update(numbers)
+
+    def result(self) -> Dict[str, object]:
+        """
+        Get the requested aggregates.
+
+        The minimum, maximum and mean of an input without numbers are None.
+        The histogram maps the lower bound of every non-empty bucket to its count.
+
+        Returns:
+            Dict[str, object]: The value of every requested aggregate, by name.
+        """
+        values = {
+            SUM: self.total,
+            COUNT: self.count,
+            MIN: self.minimum,
+            MAX: self.maximum,
+            MEAN: self.total / self.count if self.count else None,
+            HISTOGRAM: dict(sorted(self.buckets.items())),
+        }
+        return {op: values[op] for op in self.ops}
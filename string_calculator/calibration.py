@@ -0,0 +1,120 @@
+"""
+One-time calibration of the String Calculator engines.
+
+This module times every engine on synthetic inputs of every format and of
+growing size, and derives the thresholds of the CalibrationProfile used by
+EnginePlanner.
+"""
+import os
+import time
+from typing import Dict, List, Optional, Sequence
+
+from string_calculator.engines import ENGINES, PARALLEL, PER_TOKEN, SCANNER, VECTORIZED
+from string_calculator.planner import CalibrationProfile, EnginePlanner
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+DEFAULT_SIZES = tuple(4 ** exponent for exponent in range(2, 12))
+
+
+def measure(calculator: StringCalculator, engine: str, input_str: str, repeat: int = 3) -> float:
+    """
+    Time an engine on an input.
+
+    Args:
+        calculator (StringCalculator): The calculator running the engine.
+        engine (str): The engine name.
+        input_str (str): The input string.
+        repeat (int, optional): The number of runs. Defaults to 3.
+
+    Returns:
+        float: The best time, in seconds.
+    """
+    # Run small inputs many times per measurement to get above the clock resolution
+    loops = max(1, 4096 // max(1, len(input_str)))
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            calculator.run_engine(engine, input_str)
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def _first_winning_size(timings: Dict[int, Dict[str, float]], engine: str,
+                        baselines: Sequence[str]) -> Optional[int]:
+    """
+    Find the smallest size from which an engine beats its baselines at every larger size.
+
+    Args:
+        timings (Dict[int, Dict[str, float]]): The time of every engine, by input size.
+        engine (str): The engine to check.
+        baselines (Sequence[str]): The engines it has to beat.
+
+    Returns:
+        Optional[int]: The threshold, or None if the engine never wins.
+    """
+    threshold = None
+    for size in sorted(timings, reverse=True):
+        if all(timings[size][engine] < timings[size][baseline] for baseline in baselines):
+            threshold = size
+        else:
+            break
+    return threshold
+
+
+def calibrate(sizes: Sequence[int] = DEFAULT_SIZES, workers: int = None,
+              path: str = None, save: bool = True) -> CalibrationProfile:
+    """
+    Time every engine and build the matching calibration profile.
+
+    The 'default' format gives the thresholds shared by every format, and the
+    other formats get their own thresholds.
+
+    Args:
+        sizes (Sequence[int], optional): The sizes of the numbers to try, in characters,
+            not counting the header line.
+        workers (int, optional): The number of workers of the parallel engine.
+            Defaults to the CPU count.
+        path (str, optional): Where to save the profile. Defaults to default_profile_path().
+        save (bool, optional): Whether to save the profile. Defaults to True.
+
+    Returns:
+        CalibrationProfile: The calibrated profile.
+    """
+    workers = workers or os.cpu_count() or 1
+    calculator = StringCalculator(planner=EnginePlanner(CalibrationProfile(workers=workers)))
+
+    engines: List[str] = list(ENGINES) if workers > 1 else [PER_TOKEN, SCANNER, VECTORIZED]
+    format_thresholds = {}
+    for input_format in INPUT_FORMATS:
+        timings = {}
+        for size in sizes:
+            # Numbers of up to 3 digits take 3 characters on average with their delimiter
+            spec = WorkloadSpec(input_format=input_format, num_tokens=max(1, size // 3), seed=size)
+            input_str = generate_workload(spec)
+            timings[size] = {engine: measure(calculator, engine, input_str) for engine in engines}
+        format_thresholds[input_format] = {
+            'scanner_threshold': _first_winning_size(timings, SCANNER, [PER_TOKEN]),
+            'vectorized_threshold': _first_winning_size(timings, VECTORIZED, [PER_TOKEN, SCANNER]),
+            'parallel_threshold': (
+                _first_winning_size(timings, PARALLEL, [PER_TOKEN, SCANNER, VECTORIZED])
+                if PARALLEL in engines else None
+            ),
+        }
+
+    profile = CalibrationProfile(
+        workers=workers,
+        format_thresholds={
+            input_format: thresholds for input_format, thresholds in format_thresholds.items()
+            if input_format != 'default'
+        },
+        **format_thresholds['default']
+    )
+    if save:
+        profile.save(path)
+    return profile
+
+
+if __name__ == "__main__":
+    print(calibrate())
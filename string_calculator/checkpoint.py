@@ -0,0 +1,292 @@
+"""
+Checkpoint and resume support for long-running String Calculator sums.
+
+A checkpointed run periodically saves how far it got in a file or a stream,
+so that an interrupted run can be resumed instead of started over.
+"""
+import codecs
+import json
+import os
+from itertools import chain
+from typing import Iterable, List
+
+from string_calculator.compression import open_input
+from string_calculator.implementations import DefaultInputParser
+from string_calculator.streaming import StreamTokenizer
+
+# The JSON types of the checkpoint fields
+_FIELD_TYPES = {
+    'offset': (int,),
+    'total': (int,),
+    'header': (str, type(None)),
+    'pending': (str,),
+    'negative_numbers': (list,),
+    'source_size': (int, type(None)),
+    'source_mtime_ns': (int, type(None)),
+}
+
+
+class Checkpoint:
+    """
+    The state of a streaming sum, saved at a delimiter boundary.
+    """
+
+    def __init__(self, offset: int = 0, total: int = 0, header: str = None,
+                 pending: str = '', negative_numbers: List[int] = None,
+                 source_size: int = None, source_mtime_ns: int = None):
+        """
+        Initialize the checkpoint.
+
+        Args:
+            offset (int, optional): The byte offset up to which the input has been summed,
+                or the character offset for streams. It is either the start of the input
+                or the start of a delimiter.
+            total (int, optional): The running sum up to the offset. Defaults to 0.
+            header (str, optional): The header line of the input, '' if it has none,
+                or None if it has not been read yet. Defaults to None.
+            pending (str, optional): The partial number read after the offset, not summed yet.
+                Defaults to ''.
+            negative_numbers (List[int], optional): The negative numbers found up to the offset.
+            source_size (int, optional): The size of the input file when it was summed,
+                or None for streams.
+            source_mtime_ns (int, optional): The modification time of the input file when it
+                was summed, in nanoseconds.
+        """
+        self.offset = offset
+        self.total = total
+        self.header = header
+        self.pending = pending
+        self.negative_numbers = negative_numbers if negative_numbers is not None else []
+        self.source_size = source_size
+        self.source_mtime_ns = source_mtime_ns
+
+    def to_dict(self) -> dict:
+        """
+        Convert the checkpoint to a JSON-compatible dictionary.
+
+        Returns:
+            dict: The checkpoint fields.
+        """
+        return {
+            'offset': self.offset,
+            'total': self.total,
+            'header': self.header,
+            'pending': self.pending,
+            'negative_numbers': self.negative_numbers,
+            'source_size': self.source_size,
+            'source_mtime_ns': self.source_mtime_ns,
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Save the checkpoint atomically, so that a crash never leaves a partial file.
+
+        Args:
+            path (str): The checkpoint file.
+        """
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(self.to_dict(), checkpoint_file)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'Checkpoint':
+        """
+        Load a saved checkpoint, falling back to the start of the input.
+
+        A missing, unreadable or malformed file gives an empty checkpoint, which
+        matches no input, so that the input is summed from the start. Unknown keys
+        are ignored.
+
+        Args:
+            path (str): The checkpoint file.
+
+        Returns:
+            Checkpoint: The saved checkpoint, or an empty one if there is none.
+        """
+        try:
+            with open(path, encoding='utf-8') as checkpoint_file:
+                fields = json.load(checkpoint_file)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(fields, dict):
+            return cls()
+        fields = {key: value for key, value in fields.items() if key in _FIELD_TYPES}
+        if not all(type(value) in _FIELD_TYPES[key] for key, value in fields.items()):
+            return cls()
+        if not all(type(num) is int for num in fields.get('negative_numbers', [])):
+            return cls()
+        return cls(**fields)
+
+    def matches(self, path: str) -> bool:
+        """
+        Check whether the checkpoint was saved for the current contents of a file.
+
+        Args:
+            path (str): The input file.
+
+        Returns:
+            bool: True if the file has the size and modification time it had when summed.
+        """
+        stat = os.stat(path)
+        return (self.source_size, self.source_mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+
+    def __repr__(self):
+        return (
+            f"Checkpoint(offset={self.offset}, total={self.total}, header={self.header!r}, "
+            f"pending={self.pending!r}, negative_numbers={len(self.negative_numbers)})"
+        )
+
+
+def add_file_with_checkpoints(calculator, path: str, checkpoint_path: str,
+                              checkpoint: Checkpoint = None, chunk_size: int = 1 << 20,
+                              checkpoint_every: int = 64 << 20) -> int:
+    """
+    Sum a file, saving a checkpoint every checkpoint_every bytes.
+
+    The checkpoint file is removed once the sum completes, so that a finished
+    run is never resumed by mistake. A checkpoint saved for another file, or
+    before the file was modified, is ignored and the file is summed from the
+    start. For compressed files, offsets count decompressed bytes, and resuming
+    decompresses up to the offset again.
+
+    Args:
+        calculator (StringCalculator): The calculator whose parser and validator are used.
+        path (str): The file holding the input string.
+        checkpoint_path (str): The checkpoint file.
+        checkpoint (Checkpoint, optional): The checkpoint to resume from.
+            Defaults to the start of the file.
+        chunk_size (int, optional): The number of bytes read at once. Defaults to 1 MiB.
+        checkpoint_every (int, optional): The number of bytes between checkpoints.
+            Defaults to 64 MiB.
+
+    Returns:
+        int: The sum of the numbers.
+
+    Raises:
+        ValueError: If a number is malformed or negative, or the calculator does not use
+            DefaultInputParser.
+    """
+    if type(calculator.parser) is not DefaultInputParser:
+        raise ValueError("checkpoints require a calculator using DefaultInputParser")
+
+    stat = os.stat(path)
+    if checkpoint is None or not checkpoint.matches(path):
+        checkpoint = Checkpoint()
+    # The bytes before the offset are the header and the body parsed so far
+    header_size = len(checkpoint.header.encode('utf-8')) if checkpoint.header is not None else 0
+    tokenizer = StreamTokenizer(calculator.parser, checkpoint.header, checkpoint.pending,
+                                parsed_body=checkpoint.offset > header_size)
+    total = checkpoint.total
+    negative_numbers = list(checkpoint.negative_numbers)
+    decoder = codecs.getincrementaldecoder('utf-8')()
+
+    with open_input(path) as input_file:
+        # The pending text has already been read: continue right after it
+        position = checkpoint.offset + len(checkpoint.pending.encode('utf-8'))
+        input_file.seek(position)
+        last_checkpoint = position
+        while True:
+            data = input_file.read(chunk_size)
+            position += len(data)
+            text = decoder.decode(data, final=not data)
+            numbers = tokenizer.feed(text) if data else tokenizer.close()
+            total += sum(calculator.validate_batch(numbers, negative_numbers))
+            if not data:
+                break
+
+            if position - last_checkpoint >= checkpoint_every and tokenizer.resumable:
+                buffered, _ = decoder.getstate()
+                Checkpoint(
+                    offset=position - len(buffered) - len(tokenizer.pending.encode('utf-8')),
+                    total=total,
+                    header=tokenizer.header,
+                    pending=tokenizer.pending,
+                    negative_numbers=negative_numbers,
+                    source_size=stat.st_size,
+                    source_mtime_ns=stat.st_mtime_ns,
+                ).save(checkpoint_path)
+                last_checkpoint = position
+
+    calculator.validator.validate(negative_numbers)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return total
+
+
+def load_stream_checkpoint(checkpoint_path: str) -> Checkpoint:
+    """
+    Load the checkpoint of a stream, falling back to the start of the stream.
+
+    Args:
+        checkpoint_path (str): The checkpoint file.
+
+    Returns:
+        Checkpoint: The saved checkpoint, or an empty one if there is none or it
+            was saved for a file.
+    """
+    checkpoint = Checkpoint.load(checkpoint_path)
+    if checkpoint.source_size is not None or checkpoint.pending:
+        return Checkpoint()
+    return checkpoint
+
+
+def add_stream_with_checkpoints(calculator, chunks: Iterable[str], checkpoint_path: str,
+                                checkpoint: Checkpoint = None,
+                                checkpoint_every: int = 64 << 20) -> int:
+    """
+    Sum a stream of chunks, saving a checkpoint every checkpoint_every characters.
+
+    A stream cannot be read again by the calculator, so a resumed run is given
+    the chunks from the character offset of the checkpoint on, replayed by the
+    caller. The checkpoint file is removed once the sum completes.
+
+    Args:
+        calculator (StringCalculator): The calculator whose parser and validator are used.
+        chunks (Iterable[str]): Consecutive chunks of the input string, starting at the
+            offset of the checkpoint.
+        checkpoint_path (str): The checkpoint file.
+        checkpoint (Checkpoint, optional): The checkpoint to resume from.
+            Defaults to the start of the stream.
+        checkpoint_every (int, optional): The number of characters between checkpoints.
+            Defaults to 64 Mi characters.
+
+    Returns:
+        int: The sum of the numbers.
+
+    Raises:
+        ValueError: If a number is malformed or negative, or the calculator does not use
+            DefaultInputParser.
+    """
+    if type(calculator.parser) is not DefaultInputParser:
+        raise ValueError("checkpoints require a calculator using DefaultInputParser")
+
+    checkpoint = checkpoint or Checkpoint()
+    header_size = len(checkpoint.header) if checkpoint.header is not None else 0
+    tokenizer = StreamTokenizer(calculator.parser, checkpoint.header,
+                                parsed_body=checkpoint.offset > header_size)
+    total = checkpoint.total
+    negative_numbers = list(checkpoint.negative_numbers)
+
+    position = last_checkpoint = checkpoint.offset
+    for chunk in chain(chunks, [None]):
+        numbers = tokenizer.feed(chunk) if chunk is not None else tokenizer.close()
+        total += sum(calculator.validate_batch(numbers, negative_numbers))
+        if chunk is None:
+            break
+
+        position += len(chunk)
+        if position - last_checkpoint >= checkpoint_every and tokenizer.resumable:
+            # The pending text is read again from the offset when resuming
+            Checkpoint(
+                offset=position - len(tokenizer.pending),
+                total=total,
+                header=tokenizer.header,
+                negative_numbers=negative_numbers,
+            ).save(checkpoint_path)
+            last_checkpoint = position
+
+    calculator.validator.validate(negative_numbers)
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return total
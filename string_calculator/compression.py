@@ -0,0 +1,138 @@
+"""
+Compressed input support for the String Calculator.
+
+This module reads gzip, bz2 and xz/lzma compressed inputs with the standard
+library codecs. Decompression runs in a producer thread that feeds a bounded
+queue of text chunks, so that it overlaps with parsing while peak memory
+stays bounded by the queue size.
+"""
+import bz2
+import codecs
+import gzip
+import lzma
+import queue
+import threading
+from typing import BinaryIO, Iterator
+
+# Magic numbers at the start of each compressed format
+_OPENERS = (
+    (b'\x1f\x8b', gzip.open),
+    (b'BZh', bz2.open),
+    (b'\xfd7zXZ\x00', lzma.open),
+    (b'\x5d\x00\x00', lzma.open),
+)
+
+_END = object()
+
+
+def compression_opener(path: str):
+    """
+    Detect the compression of a file from its first bytes.
+
+    Args:
+        path (str): The file to check.
+
+    Returns:
+        Callable or None: The stdlib open function of the format, or None for plain files.
+    """
+    with open(path, 'rb') as input_file:
+        magic = input_file.read(6)
+    for prefix, opener in _OPENERS:
+        if magic.startswith(prefix):
+            return opener
+    return None
+
+
+def open_input(path: str) -> BinaryIO:
+    """
+    Open a plain or compressed file for reading bytes.
+
+    Args:
+        path (str): The file to open.
+
+    Returns:
+        BinaryIO: A file object yielding the decompressed bytes.
+    """
+    opener = compression_opener(path)
+    return opener(path, 'rb') if opener is not None else open(path, 'rb')
+
+
+class _Producer(threading.Thread):
+    """
+    Thread decompressing a file into a bounded queue of text chunks.
+    """
+
+    def __init__(self, path: str, chunk_size: int, chunks: queue.Queue):
+        """
+        Initialize the producer.
+
+        Args:
+            path (str): The file to decompress.
+            chunk_size (int): The number of decompressed bytes per chunk.
+            chunks (queue.Queue): The bounded queue shared with the consumer.
+        """
+        super().__init__(name=f"decompress {path}", daemon=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.chunks = chunks
+        self.stopped = threading.Event()
+
+    def run(self):
+        """Decompress and decode the file, then put the end marker or the error."""
+        try:
+            decoder = codecs.getincrementaldecoder('utf-8')()
+            with open_input(self.path) as input_file:
+                while not self.stopped.is_set():
+                    data = input_file.read(self.chunk_size)
+                    text = decoder.decode(data, final=not data)
+                    if text and not self._put(text):
+                        return
+                    if not data:
+                        break
+            self._put(_END)
+        except Exception as error:
+            # Hand the error over to the consumer, which raises it
+            self._put(error)
+
+    def _put(self, item) -> bool:
+        """Put an item in the queue, giving up if the consumer stopped."""
+        while not self.stopped.is_set():
+            try:
+                self.chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+def iter_decompressed_chunks(path: str, chunk_size: int = 1 << 20,
+                             queue_size: int = 4) -> Iterator[str]:
+    """
+    Read a plain or compressed file in chunks, decompressing in a producer thread.
+
+    At most queue_size decoded chunks wait in memory at any time, plus the one
+    being decompressed and the one being parsed.
+
+    Args:
+        path (str): The file to read.
+        chunk_size (int, optional): The number of decompressed bytes per chunk. Defaults to 1 MiB.
+        queue_size (int, optional): The number of chunks buffered between the threads.
+            Defaults to 4.
+
+    Yields:
+        str: Consecutive chunks of the decompressed text.
+    """
+    chunks = queue.Queue(maxsize=queue_size)
+    producer = _Producer(path, chunk_size, chunks)
+    producer.start()
+    try:
+        while True:
+            item = chunks.get()
+            if item is _END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        producer.stopped.set()
+        producer.join()
@@ -0,0 +1,127 @@
+"""
+Differential testing for the String Calculator.
+
+This module runs alternative calculator implementations against the reference
+StringCalculator and reports every input on which they disagree.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from string_calculator.string_calculator import StringCalculator
+
+# (sum, error message): exactly one of them is set.
+Outcome = Tuple[Optional[int], Optional[str]]
+
+
+def evaluate(calculator, input_str: str) -> Outcome:
+    """
+    Run a calculator on an input and capture its outcome.
+
+    Args:
+        calculator: Any object with an add(str) method.
+        input_str (str): The input string.
+
+    Returns:
+        Outcome: A tuple containing (sum, None) or (None, error_message).
+    """
+    try:
+        return calculator.add(input_str), None
+    except Exception as error:
+        # Every failure, not only ValueError, is part of the outcome
+        return None, f"{type(error).__name__}: {error}"
+
+
+class Mismatch:
+    """
+    A difference between a candidate and the reference calculator.
+    """
+
+    def __init__(self, candidate: str, source: str, expected: Outcome, actual: Outcome):
+        """
+        Initialize the mismatch.
+
+        Args:
+            candidate (str): The name of the candidate calculator.
+            source (str): The input string or the file it was read from.
+            expected (Outcome): The outcome of the reference calculator.
+            actual (Outcome): The outcome of the candidate calculator.
+        """
+        self.candidate = candidate
+        self.source = source
+        self.expected = expected
+        self.actual = actual
+
+    def __repr__(self):
+        source = self.source if len(self.source) <= 40 else self.source[:37] + '...'
+        return (
+            f"Mismatch(candidate={self.candidate!r}, source={source!r}, "
+            f"expected={self.expected!r}, actual={self.actual!r})"
+        )
+
+
+class DifferentialHarness:
+    """
+    Compares candidate calculators with a reference calculator.
+    """
+
+    def __init__(self, candidates: Dict[str, object], reference: StringCalculator = None):
+        """
+        Initialize the harness.
+
+        Args:
+            candidates (Dict[str, object]): The calculators to check, by name. A candidate
+                is usually a StringCalculator built with an alternative parser or validator.
+            reference (StringCalculator, optional): The calculator taken as the truth.
+                Defaults to a StringCalculator with its default dependencies.
+        """
+        self.candidates = candidates
+        self.reference = reference if reference is not None else StringCalculator()
+
+    def check(self, input_str: str, source: str = None) -> List[Mismatch]:
+        """
+        Check every candidate on a single input.
+
+        Args:
+            input_str (str): The input string.
+            source (str, optional): The name reported for the input. Defaults to the input itself.
+
+        Returns:
+            List[Mismatch]: The candidates whose sum or error message differs.
+        """
+        expected = evaluate(self.reference, input_str)
+        mismatches = []
+        for name, candidate in self.candidates.items():
+            actual = evaluate(candidate, input_str)
+            if actual != expected:
+                mismatches.append(
+                    Mismatch(name, input_str if source is None else source, expected, actual)
+                )
+        return mismatches
+
+    def run(self, inputs: Iterable[str]) -> List[Mismatch]:
+        """
+        Check every candidate on several inputs.
+
+        Args:
+            inputs (Iterable[str]): The input strings.
+
+        Returns:
+            List[Mismatch]: All the differences found.
+        """
+        mismatches = []
+        for input_str in inputs:
+            mismatches.extend(self.check(input_str))
+        return mismatches
+
+    def run_file(self, path: str) -> List[Mismatch]:
+        """
+        Check every candidate on the contents of a file.
+
+        Args:
+            path (str): The file holding the input, e.g. written by write_workload.
+
+        Returns:
+            List[Mismatch]: The differences found, reported against the file path.
+        """
+        with open(path, encoding='utf-8', newline='') as input_file:
+            input_str = input_file.read()
+        return self.check(input_str, source=path)
@@ -0,0 +1,372 @@
+"""
+Edit-aware incremental sums for the String Calculator.
+
+This module keeps a document parsed as a balanced tree of token segments, so
+that the sum can be updated after an edit by re-tokenizing only the text
+around the edit.
+"""
+import random
+from typing import Iterator, List, Optional, Tuple
+
+from string_calculator.engines import negative_numbers_error
+from string_calculator.implementations import DefaultInputParser, DelimiterCuts, create_default_parser
+
+
+class _Segment:
+    """
+    A node of the segment tree: a piece of the body with its partial results,
+    and the aggregated results of its subtree.
+    """
+
+    __slots__ = ('text', 'total', 'negatives', 'error', 'clean', 'priority', 'left', 'right',
+                 'size', 'length', 'sub_total', 'negative_segments', 'error_segments')
+
+    def __init__(self, text: str, total: int, negatives: List[int], error: Optional[str],
+                 clean: bool, priority: float):
+        self.text = text
+        self.total = total
+        self.negatives = negatives
+        self.error = error
+        # Whether the transformed text starts with the delimiter, so that the
+        # segment does not continue the last number of the previous segment
+        self.clean = clean
+        self.priority = priority
+        self.left = None
+        self.right = None
+        _update(self)
+
+
+def _update(node: _Segment) -> None:
+    """Recompute the subtree aggregates of a node from its children."""
+    left, right = node.left, node.right
+    node.size = 1
+    node.length = len(node.text)
+    node.sub_total = node.total
+    node.negative_segments = 1 if node.negatives else 0
+    node.error_segments = 1 if node.error is not None else 0
+    for child in (left, right):
+        if child is not None:
+            node.size += child.size
+            node.length += child.length
+            node.sub_total += child.sub_total
+            node.negative_segments += child.negative_segments
+            node.error_segments += child.error_segments
+
+
+def _size(node: Optional[_Segment]) -> int:
+    return node.size if node is not None else 0
+
+
+def _merge(left: Optional[_Segment], right: Optional[_Segment]) -> Optional[_Segment]:
+    """Concatenate two trees."""
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        _update(left)
+        return left
+    right.left = _merge(left, right.left)
+    _update(right)
+    return right
+
+
+def _split(node: Optional[_Segment], count: int) -> Tuple[Optional[_Segment], Optional[_Segment]]:
+    """Split a tree into its first count segments and the rest."""
+    if node is None:
+        return None, None
+    if count <= _size(node.left):
+        left, node.left = _split(node.left, count)
+        _update(node)
+        return left, node
+    node.right, right = _split(node.right, count - _size(node.left) - 1)
+    _update(node)
+    return node, right
+
+
+def _locate(node: _Segment, position: int) -> Tuple[int, int]:
+    """Find the index and start offset of the segment holding a body position."""
+    index = start = 0
+    while True:
+        left_length = node.left.length if node.left is not None else 0
+        if position < left_length:
+            node = node.left
+            continue
+        index += _size(node.left)
+        start += left_length
+        if position < left_length + len(node.text) or node.right is None:
+            return index, start
+        position -= left_length + len(node.text)
+        start += len(node.text)
+        index += 1
+        node = node.right
+
+
+def _build(segments: List[_Segment]) -> Optional[_Segment]:
+    """Build a tree from segments in order, in linear time."""
+    stack = []
+    for segment in segments:
+        last = None
+        while stack and stack[-1].priority < segment.priority:
+            last = stack.pop()
+            _update(last)
+        segment.left = last
+        if stack:
+            stack[-1].right = segment
+        stack.append(segment)
+    root = stack[0] if stack else None
+    while stack:
+        _update(stack.pop())
+    return root
+
+
+def _iter_segments(node: Optional[_Segment], counter: str) -> Iterator[_Segment]:
+    """Iterate in order over the segments for which counter is set."""
+    if node is None or not getattr(node, counter):
+        return
+    yield from _iter_segments(node.left, counter)
+    if (node.negatives if counter == 'negative_segments' else node.error is not None):
+        yield node
+    yield from _iter_segments(node.right, counter)
+
+
+class IndexedDocument:
+    """
+    A document whose sum is kept up to date under edits.
+
+    The body is cut into segments at every position found by DelimiterCuts, so
+    every segment can be tokenized on its own by the delimiter strategy, exactly
+    as inside the whole document. Each segment stores its partial sum, its negative numbers and
+    its first malformed number in a treap, so that an edit only re-tokenizes
+    the segments it touches and their neighbours: O(log n + edit size).
+
+    Edits of the header line and edits inserting or removing square brackets
+    fall back to parsing the whole document again.
+    """
+
+    def __init__(self, text: str = '', parser: DefaultInputParser = None):
+        """
+        Parse a document.
+
+        Args:
+            text (str, optional): The initial text. Defaults to ''.
+            parser (DefaultInputParser, optional): The parser whose strategies are used.
+                Defaults to DefaultInputParser with the standard strategies.
+        """
+        self.parser = parser if parser is not None else create_default_parser()
+        self._random = random.Random()
+        self._rebuild(text)
+
+    @property
+    def text(self) -> str:
+        """
+        Get the current text of the document.
+
+        Returns:
+            str: The document text.
+        """
+        if self._root is None:
+            return self._header
+        return self._header + "".join(segment.text for segment in self._in_order(self._root))
+
+    def __len__(self):
+        return len(self._header) + (self._root.length if self._root is not None else 0)
+
+    def sum(self) -> int:
+        """
+        Get the sum of the document, as StringCalculator.add would compute it.
+
+        Returns:
+            int: The sum of the numbers.
+
+        Raises:
+            ValueError: If a number is malformed or negative.
+        """
+        if self._strategy is None:
+            return self._whole_sum(self._header)
+        root = self._root
+        if root is None:
+            return 0
+        if root.error_segments:
+            raise ValueError(next(_iter_segments(root, 'error_segments')).error)
+        if root.negative_segments:
+            raise negative_numbers_error([
+                num for segment in _iter_segments(root, 'negative_segments')
+                for num in segment.negatives
+            ])
+        return root.sub_total
+
+    def apply_edit(self, offset: int, deleted_len: int, inserted_text: str) -> int:
+        """
+        Replace deleted_len characters at offset with inserted_text.
+
+        The edit is applied even if the new document is invalid.
+
+        Args:
+            offset (int): The position of the edit.
+            deleted_len (int): The number of characters to delete.
+            inserted_text (str): The text to insert.
+
+        Returns:
+            int: The sum of the edited document.
+
+        Raises:
+            ValueError: If the edit is out of range, or a number is malformed or negative.
+        """
+        if offset < 0 or deleted_len < 0 or offset + deleted_len > len(self):
+            raise ValueError(f"edit out of range: {offset}, {deleted_len}")
+
+        header_len = len(self._header)
+        if (self._strategy is None or offset < header_len
+                or (header_len and self._edits_brackets(offset, deleted_len, inserted_text))):
+            text = self.text
+            self._rebuild(text[:offset] + inserted_text + text[offset + deleted_len:])
+        else:
+            self._edit_body(offset - header_len, deleted_len, inserted_text)
+            if not header_len and self._starts_with_header():
+                self._rebuild(self.text)
+        return self.sum()
+
+    def _starts_with_header(self) -> bool:
+        """Check whether the body now starts with a header, which changes the strategy."""
+        node = self._root
+        while node is not None and node.left is not None:
+            node = node.left
+        # Segments are only cut before delimiters, so the first one holds the whole "//" prefix if any
+        return node is not None and node.text.startswith('//')
+
+    def _edits_brackets(self, offset: int, deleted_len: int, inserted_text: str) -> bool:
+        """Check whether an edit could change the strategy chosen by the parser."""
+        if '[' in inserted_text or ']' in inserted_text:
+            return True
+        if not deleted_len:
+            return False
+        deleted = self._body_slice(offset - len(self._header), deleted_len)
+        return '[' in deleted or ']' in deleted
+
+    def _body_slice(self, start: int, length: int) -> str:
+        """Get a slice of the body by visiting only the segments it spans."""
+        first, first_start = _locate(self._root, start)
+        last, _ = _locate(self._root, start + length - 1)
+        left, rest = _split(self._root, first)
+        middle, right = _split(rest, last - first + 1)
+        text = "".join(segment.text for segment in self._in_order(middle))
+        self._root = _merge(_merge(left, middle), right)
+        return text[start - first_start:start - first_start + length]
+
+    def _edit_body(self, offset: int, deleted_len: int, inserted_text: str) -> None:
+        """Apply an edit to the body, re-tokenizing only the segments around it."""
+        root = self._root
+        if root is None:
+            self._root = _build(self._segments(inserted_text))
+            return
+
+        end = offset + deleted_len
+        first, region_start = _locate(root, max(offset - 1, 0))
+        last, _ = _locate(root, min(end, root.length - 1))
+        left, rest = _split(root, first)
+        middle, right = _split(rest, last - first + 1)
+        region = "".join(segment.text for segment in self._in_order(middle))
+        region = (region[:offset - region_start] + inserted_text
+                  + region[end - region_start:])
+
+        while True:
+            segments = self._segments(region)
+            if left is not None and segments and not segments[0].clean:
+                # The region continues the last number before it
+                left, previous = _split(left, left.size - 1)
+                region = previous.text + region
+                continue
+            if right is not None and not self._cuts.is_safe(region, len(region)):
+                # The cut before the next segment is no longer safe
+                following, right = _split(right, 1)
+                region = region + following.text
+                continue
+            break
+
+        self._root = _merge(_merge(left, _build(segments)), right)
+
+    def _rebuild(self, text: str) -> None:
+        """Parse the whole document."""
+        self._header = text
+        self._strategy = None
+        self._cuts = None
+        self._root = None
+
+        if text.startswith('//'):
+            newline = text.find('\n')
+            if newline == -1:
+                return
+            header, body = text[:newline + 1], text[newline + 1:]
+        else:
+            header, body = '', text
+
+        strategy = self.parser.select_strategy(text)
+        delimiters = strategy.extract_delimiters(header) + ['\n']
+        if delimiters[:-1] != strategy.extract_delimiters(text):
+            # The delimiters are not declared on the header line alone
+            return
+        if not all(delimiters):
+            # Splitting with an empty delimiter fails: let the parser report it
+            return
+
+        self._header = header
+        self._strategy = strategy
+        self._cuts = DelimiterCuts(delimiters)
+        self._root = _build(self._segments(body))
+
+    def _segments(self, text: str) -> List[_Segment]:
+        """Cut a part of the body into tokenized segments."""
+        segments = []
+        start = 0
+        for cut in self._cuts.all(text) + [len(text)]:
+            if cut == start:
+                continue
+            segment = self._segment(text[start:cut])
+            if segments and not segment.clean:
+                previous = segments.pop()
+                segment = self._segment(previous.text + segment.text)
+            segments.append(segment)
+            start = cut
+        return segments
+
+    def _segment(self, text: str) -> _Segment:
+        """Tokenize a piece of the body with the delimiter strategy."""
+        delimiter, numbers_str = self._strategy.extract_delimiter_and_numbers(self._header + text)
+        total = 0
+        negatives = []
+        error = None
+        for token in numbers_str.split(delimiter):
+            if token:
+                try:
+                    num = int(token)
+                except ValueError as int_error:
+                    error = str(int_error)
+                    break
+                if num < 0:
+                    negatives.append(num)
+                elif num <= 1000:
+                    total += num
+        return _Segment(text, total, negatives, error, numbers_str.startswith(delimiter),
+                        self._random.random())
+
+    def _whole_sum(self, text: str) -> int:
+        """Sum a document that cannot be segmented."""
+        numbers = self.parser.parse(text)
+        negatives = [num for num in numbers if num < 0]
+        if negatives:
+            raise negative_numbers_error(negatives)
+        return sum(num for num in numbers if num <= 1000)
+
+    @staticmethod
+    def _in_order(node: Optional[_Segment]) -> Iterator[_Segment]:
+        """Iterate over the segments of a tree in document order."""
+        stack = []
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node
+            node = node.right
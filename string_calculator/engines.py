@@ -0,0 +1,211 @@
+"""
+Execution engines for the String Calculator.
+
+Each engine sums the numbers string produced by a delimiter strategy with the
+same rules as DefaultInputParser followed by NegativeNumberValidator and the
+upper-limit filter: the first malformed number raises the int() error, then
+negative numbers raise "negative numbers not allowed", and numbers greater
+than the upper limit are ignored.
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple
+
+from string_calculator.implementations import DelimiterCuts
+
+PER_TOKEN = 'per_token'
+SCANNER = 'scanner'
+VECTORIZED = 'vectorized'
+PARALLEL = 'parallel'
+
+ENGINES = (PER_TOKEN, SCANNER, VECTORIZED, PARALLEL)
+
+
+def gil_enabled() -> bool:
+    """
+    Check whether the interpreter runs with the global interpreter lock.
+
+    Returns:
+        bool: False on free-threaded builds (e.g. CPython 3.13t) running without the GIL.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return True if is_gil_enabled is None else is_gil_enabled()
+
+
+def negative_numbers_error(negative_numbers: List[int]) -> ValueError:
+    """
+    Build the error raised for negative numbers.
+
+    Args:
+        negative_numbers (List[int]): The negative numbers, in input order.
+
+    Returns:
+        ValueError: The error, worded like NegativeNumberValidator.
+    """
+    negative_numbers_str = ", ".join(str(num) for num in negative_numbers)
+    return ValueError(f"negative numbers not allowed: {negative_numbers_str}")
+
+
+def scan_sum(numbers_str: str, delimiter: str, upper_limit: int = 1000) -> int:
+    """
+    Sum the numbers in a single pass, without building the list of numbers.
+
+    Args:
+        numbers_str (str): The numbers string returned by a delimiter strategy.
+        delimiter (str): The delimiter returned by a delimiter strategy.
+        upper_limit (int, optional): Numbers greater than this are ignored. Defaults to 1000.
+
+    Returns:
+        int: The sum of the numbers.
+
+    Raises:
+        ValueError: If a number is malformed or negative.
+    """
+    total = 0
+    negative_numbers = []
+    for token in numbers_str.split(delimiter):
+        if token:
+            num = int(token)
+            if num < 0:
+                negative_numbers.append(num)
+            elif num <= upper_limit:
+                total += num
+    if negative_numbers:
+        raise negative_numbers_error(negative_numbers)
+    return total
+
+
+def _vectorized_partial(numbers_str: str, delimiter: str, upper_limit: int) -> Tuple[int, List[int]]:
+    """
+    Sum the numbers with bulk builtins, collecting negative numbers.
+
+    Args:
+        numbers_str (str): The numbers string.
+        delimiter (str): The delimiter.
+        upper_limit (int): Numbers greater than this are ignored.
+
+    Returns:
+        Tuple[int, List[int]]: A tuple containing (sum of the non-negative numbers, negative numbers)
+    """
+    numbers = list(map(int, filter(None, numbers_str.split(delimiter))))
+    if not numbers:
+        return 0, []
+    negative_numbers = []
+    if min(numbers) < 0:
+        negative_numbers = [num for num in numbers if num < 0]
+        numbers = [num for num in numbers if num >= 0]
+    return sum(filter(upper_limit.__ge__, numbers)), negative_numbers
+
+
+def vectorized_sum(numbers_str: str, delimiter: str, upper_limit: int = 1000) -> int:
+    """
+    Sum the numbers with map/filter/sum so that every loop runs in C.
+
+    Args:
+        numbers_str (str): The numbers string returned by a delimiter strategy.
+        delimiter (str): The delimiter returned by a delimiter strategy.
+        upper_limit (int, optional): Numbers greater than this are ignored. Defaults to 1000.
+
+    Returns:
+        int: The sum of the numbers.
+
+    Raises:
+        ValueError: If a number is malformed or negative.
+    """
+    total, negative_numbers = _vectorized_partial(numbers_str, delimiter, upper_limit)
+    if negative_numbers:
+        raise negative_numbers_error(negative_numbers)
+    return total
+
+
+def _safe_partial(numbers_str: str, delimiter: str, upper_limit: int):
+    """
+    Run _vectorized_partial in a worker, returning malformed numbers as a value.
+
+    Returns:
+        Tuple: A tuple containing (sum, negative numbers, error message or None)
+    """
+    try:
+        total, negative_numbers = _vectorized_partial(numbers_str, delimiter, upper_limit)
+    except ValueError as error:
+        return 0, [], str(error)
+    return total, negative_numbers, None
+
+
+def split_at_delimiters(numbers_str: str, delimiter: str, parts: int) -> List[str]:
+    """
+    Cut the numbers string into roughly equal parts at delimiter boundaries.
+
+    A cut is only made after a delimiter at a position found by DelimiterCuts,
+    so splitting every part gives the same tokens as splitting the whole.
+
+    Args:
+        numbers_str (str): The numbers string.
+        delimiter (str): The delimiter.
+        parts (int): The wanted number of parts.
+
+    Returns:
+        List[str]: The parts, in order.
+    """
+    cuts = DelimiterCuts([delimiter])
+    size = len(numbers_str)
+    step = max(1, size // parts)
+    chunks = []
+    start = 0
+    while size - start > step:
+        cut = cuts.first(numbers_str, start + step)
+        if cut == -1:
+            break
+        cut += len(delimiter)
+        chunks.append(numbers_str[start:cut])
+        start = cut
+    chunks.append(numbers_str[start:])
+    return chunks
+
+
+def parallel_sum(numbers_str: str, delimiter: str, upper_limit: int = 1000,
+                 workers: int = None, use_threads: bool = None) -> int:
+    """
+    Sum the numbers in parallel workers, one part of the string each.
+
+    Threads only run in parallel without the GIL, so worker processes are used
+    unless the interpreter is free-threaded.
+
+    Args:
+        numbers_str (str): The numbers string returned by a delimiter strategy.
+        delimiter (str): The delimiter returned by a delimiter strategy.
+        upper_limit (int, optional): Numbers greater than this are ignored. Defaults to 1000.
+        workers (int, optional): The number of workers. Defaults to the CPU count.
+        use_threads (bool, optional): Whether to use threads instead of processes.
+            Defaults to True on free-threaded interpreters.
+
+    Returns:
+        int: The sum of the numbers.
+
+    Raises:
+        ValueError: If a number is malformed or negative.
+    """
+    workers = workers or os.cpu_count() or 1
+    if use_threads is None:
+        use_threads = not gil_enabled()
+    chunks = split_at_delimiters(numbers_str, delimiter, workers)
+    if len(chunks) == 1:
+        return vectorized_sum(numbers_str, delimiter, upper_limit)
+
+    executor_type = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with executor_type(max_workers=workers) as executor:
+        results = list(executor.map(
+            _safe_partial, chunks, [delimiter] * len(chunks), [upper_limit] * len(chunks)
+        ))
+
+    total = 0
+    negative_numbers = []
+    for partial_total, partial_negatives, error in results:
+        if error is not None:
+            raise ValueError(error)
+        total += partial_total
+        negative_numbers.extend(partial_negatives)
+    if negative_numbers:
+        raise negative_numbers_error(negative_numbers)
+    return total
@@ -112,9 +112,33 @@ class MultipleDelimiterStrategy(IDelimiterStrategy):
             return ',', input_str
         
         # Extract the delimiters section and the numbers section
-        delimiters_section = input_str[2:newline_pos]
+        delimiters = self.extract_delimiters(input_str)
         numbers_str = input_str[newline_pos + 1:]
         
+        # Replace all occurrences of each delimiter with the special delimiter
+        for delimiter in delimiters:
+            numbers_str = numbers_str.replace(delimiter, special_delimiter)
+        
+        # Replace newlines with the special delimiter as well
+        numbers_str = numbers_str.replace('\n', special_delimiter)
+        
+        return special_delimiter, numbers_str
+    
+    def extract_delimiters(self, input_str: str) -> List[str]:
+        """
+        Extract all delimiters enclosed in square brackets.
+        
+        Args:
+            input_str (str): The input string to process, in the format "//[delimiter1][delimiter2]...[delimiterN]\n[numbers]".
+            
+        Returns:
+            List[str]: The delimiters, in the order they are declared.
+        """
+        newline_pos = input_str.find('\n')
+        if newline_pos == -1:
+            return [',']
+        delimiters_section = input_str[2:newline_pos]
+        
         # Extract all delimiters enclosed in square brackets
         delimiters = []
         start_pos = 0
@@ -131,14 +155,7 @@ class MultipleDelimiterStrategy(IDelimiterStrategy):
             delimiters.append(delimiter)
             start_pos = close_bracket + 1
         
-        # Replace all occurrences of each delimiter with the special delimiter
-        for delimiter in delimiters:
-            numbers_str = numbers_str.replace(delimiter, special_delimiter)
-        
-        # Replace newlines with the special delimiter as well
-        numbers_str = numbers_str.replace('\n', special_delimiter)
-        
-        return special_delimiter, numbers_str
+        return delimiters
 
 
 class DefaultInputParser(IInputParser):
@@ -163,6 +180,26 @@ class DefaultInputParser(IInputParser):
         self.long_delimiter_strategy = long_delimiter_strategy
         self.multiple_delimiter_strategy = multiple_delimiter_strategy
     
+    def select_strategy(self, input_str: str) -> IDelimiterStrategy:
+        """
+        Select the delimiter strategy matching the format of the input.
+        
+        Args:
+            input_str (str): The input string to parse.
+            
+        Returns:
+            IDelimiterStrategy: The strategy to extract the delimiter and numbers with.
+        """
+        if input_str.startswith('//'):
+            # Check if it's a multiple delimiter format (with multiple square brackets)
+            if input_str.count('[') > 1 and input_str.count(']') > 1 and self.multiple_delimiter_strategy:
+                return self.multiple_delimiter_strategy
+            # Check if it's a long delimiter format (with single square brackets)
+            if '[' in input_str and ']' in input_str and self.long_delimiter_strategy:
+                return self.long_delimiter_strategy
+            return self.custom_strategy
+        return self.standard_strategy
+    
     def parse(self, input_str: str) -> List[int]:
         """
         Parse the input string into a list of integers.
@@ -176,23 +213,125 @@ class DefaultInputParser(IInputParser):
         if not input_str:
             return []
         
-        # Determine which strategy to use based on the input format
-        if input_str.startswith('//'):
-            # Check if it's a multiple delimiter format (with multiple square brackets)
-            if input_str.count('[') > 1 and input_str.count(']') > 1 and self.multiple_delimiter_strategy:
-                delimiter, numbers_str = self.multiple_delimiter_strategy.extract_delimiter_and_numbers(input_str)
-            # Check if it's a long delimiter format (with single square brackets)
-            elif '[' in input_str and ']' in input_str and self.long_delimiter_strategy:
-                delimiter, numbers_str = self.long_delimiter_strategy.extract_delimiter_and_numbers(input_str)
-            else:
-                delimiter, numbers_str = self.custom_strategy.extract_delimiter_and_numbers(input_str)
-        else:
-            delimiter, numbers_str = self.standard_strategy.extract_delimiter_and_numbers(input_str)
+        strategy = self.select_strategy(input_str)
+        delimiter, numbers_str = strategy.extract_delimiter_and_numbers(input_str)
         
         # Split by the delimiter and convert to integers
         return [int(num) for num in numbers_str.split(delimiter) if num]
 
 
+def create_default_parser() -> DefaultInputParser:
+    """
+    Create a DefaultInputParser with the standard, custom, long and multiple delimiter strategies.
+    
+    Returns:
+        DefaultInputParser: The parser used when no other one is given.
+    """
+    return DefaultInputParser(
+        StandardDelimiterStrategy(),
+        CustomDelimiterStrategy(),
+        LongDelimiterStrategy(),
+        MultipleDelimiterStrategy()
+    )
+
+
+class DelimiterCuts:
+    """
+    Finds the positions where an input body can be cut into parts that parse on their own.
+    
+    A cut is made just before a delimiter that follows a character found in no
+    delimiter, such as a digit or the carriage return of a CRLF line ending.
+    A delimiter matching across the cut would have to contain that character,
+    so splitting every part gives the same tokens as splitting the whole body.
+    Streaming, parallel and incremental parsing all cut with this rule.
+    """
+    
+    def __init__(self, delimiters: List[str]):
+        """
+        Initialize the cut finder with the delimiters of an input.
+        
+        Args:
+            delimiters (List[str]): The delimiters that can appear in the body.
+        """
+        self.delimiters = [delimiter for delimiter in delimiters if delimiter]
+        self.characters = frozenset("".join(self.delimiters))
+        # The number of characters a delimiter can span from a cut position
+        self.overlap = max((len(delimiter) for delimiter in self.delimiters), default=0)
+    
+    def is_safe(self, text: str, position: int) -> bool:
+        """
+        Check whether text can be cut at a position where a delimiter starts.
+        
+        Args:
+            text (str): The body text.
+            position (int): The start of a delimiter in text.
+            
+        Returns:
+            bool: True if the parts before and after the position parse on their own.
+        """
+        return position > 0 and text[position - 1] not in self.characters
+    
+    def last(self, text: str) -> int:
+        """
+        Find the last cut position of a text.
+        
+        Args:
+            text (str): The body text.
+            
+        Returns:
+            int: The cut position, or -1 if there is none.
+        """
+        best = -1
+        for delimiter in self.delimiters:
+            position = text.rfind(delimiter)
+            while position > max(best, 0):
+                if self.is_safe(text, position):
+                    best = position
+                    break
+                position = text.rfind(delimiter, 0, position + len(delimiter) - 1)
+        return best
+    
+    def first(self, text: str, start: int = 0) -> int:
+        """
+        Find the first cut position of a text at or after start.
+        
+        Args:
+            text (str): The body text.
+            start (int, optional): Where to start looking. Defaults to 0.
+            
+        Returns:
+            int: The cut position, or -1 if there is none.
+        """
+        best = -1
+        for delimiter in self.delimiters:
+            position = text.find(delimiter, max(start, 1))
+            while position != -1 and (best == -1 or position < best):
+                if self.is_safe(text, position):
+                    best = position
+                    break
+                position = text.find(delimiter, position + 1)
+        return best
+    
+    def all(self, text: str) -> List[int]:
+        """
+        Find every cut position of a text.
+        
+        Args:
+            text (str): The body text.
+            
+        Returns:
+            List[int]: The cut positions, in increasing order.
+        """
+        cuts = set()
+        for delimiter in self.delimiters:
+            position = text.find(delimiter, 1)
+            while position != -1:
+                if self.is_safe(text, position):
+                    cuts.add(position)
+                position = text.find(delimiter, position + 1)
+        return sorted(cuts)
+
+
 class NegativeNumberValidator(INumberValidator):
     """
     Validator that checks for negative numbers.
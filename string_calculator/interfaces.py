@@ -37,6 +37,19 @@ class IDelimiterStrategy(ABC):
             Tuple[str, str]: A tuple containing (delimiter, numbers_str)
         """
         pass
+    
+    def extract_delimiters(self, input_str: str) -> List[str]:
+        """
+        Extract the delimiters that separate numbers in the input, besides newlines.
+        
+        Args:
+            input_str (str): The input string to process, or only its header line.
+            
+        Returns:
+            List[str]: The delimiters as written in the input.
+        """
+        delimiter, _ = self.extract_delimiter_and_numbers(input_str)
+        return [delimiter]
 
 
 class INumberValidator(ABC):
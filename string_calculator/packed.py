@@ -0,0 +1,313 @@
+"""
+Binary pre-tokenized cache for the String Calculator.
+
+This module parses an input file once into a compact sidecar file of packed
+int64 values. Later runs memory-map the sidecar and validate, filter and sum
+the packed values directly, with a different upper limit or validator each
+time, without parsing the text again.
+
+Sidecar layout (native byte order, as the sidecar is a local cache):
+    magic b'SCPK', version (u16), reserved (u16),
+    header fingerprint (32 bytes, SHA-256 of the header line),
+    source checksum (32 bytes, SHA-256 of the source file),
+    source size (u64), source modification time in ns (u64),
+    count (u64), negative count (u64), maximum value (i64),
+    then count int64 values in input order.
+"""
+import hashlib
+import mmap
+import os
+import struct
+from array import array
+from itertools import chain
+from typing import List
+
+from string_calculator.compression import open_input
+from string_calculator.implementations import (
+    CompositeValidator,
+    DefaultInputParser,
+    NegativeNumberValidator,
+    UpperLimitNumberValidator,
+    create_default_parser
+)
+from string_calculator.interfaces import INumberValidator
+from string_calculator.streaming import StreamTokenizer, iter_file_chunks
+
+MAGIC = b'SCPK'
+VERSION = 1
+_HEADER = struct.Struct('=4sHH32s32sQQQQq')
+_INT64_MIN = -(1 << 63)
+# The number of header bytes hashed into the header fingerprint
+_MAX_HEADER_SIZE = 1 << 16
+
+
+def sidecar_path_for(path: str) -> str:
+    """
+    Get the default sidecar location of an input file.
+
+    Args:
+        path (str): The input file.
+
+    Returns:
+        str: The sidecar path, next to the input file.
+    """
+    return path + '.scpk'
+
+
+def _file_checksum(path: str) -> bytes:
+    """Compute the SHA-256 of a file, reading it in blocks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as source:
+        for block in iter(lambda: source.read(1 << 20), b''):
+            digest.update(block)
+    return digest.digest()
+
+
+def _header_fingerprint(path: str) -> bytes:
+    """
+    Compute the SHA-256 of the header line of a plain or compressed file.
+
+    Only the header line is read, and at most _MAX_HEADER_SIZE bytes of it: an
+    input without a header, often a single very long line, is not read at all
+    past its first two bytes.
+    """
+    with open_input(path) as source:
+        prefix = source.read(2)
+        if prefix != b'//':
+            return hashlib.sha256(b'').digest()
+        line = prefix + source.readline(_MAX_HEADER_SIZE)
+    if line.endswith(b'\n'):
+        return hashlib.sha256(line).digest()
+    if len(line) > _MAX_HEADER_SIZE:
+        # A longer header is fingerprinted by its first bytes
+        return hashlib.sha256(line + b'...').digest()
+    return hashlib.sha256(b'').digest()
+
+
+def build_sidecar(path: str, sidecar_path: str = None, parser: DefaultInputParser = None,
+                  chunk_size: int = 1 << 20) -> str:
+    """
+    Parse an input file once and write its numbers to a sidecar file.
+
+    No validation is applied: the sidecar holds every number, including the
+    negative ones and the ones above any upper limit.
+
+    Args:
+        path (str): The input file, plain or compressed.
+        sidecar_path (str, optional): The sidecar to write. Defaults to sidecar_path_for(path).
+        parser (DefaultInputParser, optional): The parser whose strategies are used.
+            Defaults to DefaultInputParser with the standard strategies.
+        chunk_size (int, optional): The number of characters parsed at once. Defaults to 1 MiB.
+
+    Returns:
+        str: The path of the written sidecar.
+
+    Raises:
+        ValueError: If a number is malformed or does not fit in 64 bits.
+    """
+    sidecar_path = sidecar_path or sidecar_path_for(path)
+    stat = os.stat(path)
+    tokenizer = StreamTokenizer(parser or create_default_parser())
+    count = negative_count = 0
+    maximum = _INT64_MIN
+
+    temporary_path = sidecar_path + '.tmp'
+    try:
+        with open(temporary_path, 'wb') as sidecar:
+            sidecar.write(b'\0' * _HEADER.size)
+            for chunk in chain(iter_file_chunks(path, chunk_size), [None]):
+                numbers = tokenizer.feed(chunk) if chunk is not None else tokenizer.close()
+                if not numbers:
+                    continue
+                try:
+                    packed = array('q', numbers)
+                except OverflowError:
+                    raise ValueError("numbers must fit in 64 bits to be packed") from None
+                count += len(numbers)
+                negative_count += sum(1 for num in numbers if num < 0)
+                maximum = max(maximum, max(numbers))
+                packed.tofile(sidecar)
+
+            sidecar.seek(0)
+            sidecar.write(_HEADER.pack(
+                MAGIC, VERSION, 0,
+                _header_fingerprint(path),
+                _file_checksum(path),
+                stat.st_size, stat.st_mtime_ns,
+                count, negative_count, maximum
+            ))
+        os.replace(temporary_path, sidecar_path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+    return sidecar_path
+
+
+def _rejects_negatives(validator: INumberValidator):
+    """
+    Tell what a validator made of the built-in validators checks.
+
+    Returns:
+        bool: Whether the validator rejects negative numbers, or None if it has
+            validators of other types.
+    """
+    if type(validator) is NegativeNumberValidator:
+        return True
+    if type(validator) is UpperLimitNumberValidator:
+        return False
+    if type(validator) is CompositeValidator:
+        checks = [_rejects_negatives(inner) for inner in validator.validators]
+        return None if None in checks else any(checks)
+    return None
+
+
+class PackedValues:
+    """
+    A memory-mapped sidecar of packed int64 values.
+    """
+
+    def __init__(self, sidecar_path: str):
+        """
+        Memory-map a sidecar file.
+
+        Args:
+            sidecar_path (str): The sidecar written by build_sidecar.
+
+        Raises:
+            ValueError: If the file is not a sidecar of a supported version.
+        """
+        with open(sidecar_path, 'rb') as sidecar:
+            header = sidecar.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise ValueError(f"not a packed sidecar: {sidecar_path}")
+            (magic, version, _, self.header_fingerprint, self.source_checksum,
+             self.source_size, self.source_mtime_ns, self.count, self.negative_count,
+             self.maximum) = _HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"not a packed sidecar: {sidecar_path}")
+            if os.fstat(sidecar.fileno()).st_size != _HEADER.size + 8 * self.count:
+                raise ValueError(f"truncated packed sidecar: {sidecar_path}")
+            self._mmap = mmap.mmap(sidecar.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+        if self._mmap is not None:
+            self._buffer = memoryview(self._mmap)[_HEADER.size:]
+        else:
+            self._buffer = memoryview(b'')
+        self.values = self._buffer.cast('q')
+
+    def close(self) -> None:
+        """Release the memory map."""
+        self.values.release()
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def is_fresh(self, path: str, verify_checksum: bool = False) -> bool:
+        """
+        Check whether the sidecar still matches its input file.
+
+        The size, modification time and header line of the file must match the
+        ones it had when the sidecar was built.
+
+        Args:
+            path (str): The input file.
+            verify_checksum (bool, optional): Whether to hash the whole input file instead of
+                trusting its size and modification time. Defaults to False.
+
+        Returns:
+            bool: True if the sidecar can be used instead of parsing the file.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if stat.st_size != self.source_size or _header_fingerprint(path) != self.header_fingerprint:
+            return False
+        if verify_checksum:
+            return _file_checksum(path) == self.source_checksum
+        return stat.st_mtime_ns == self.source_mtime_ns
+
+    def negative_numbers(self) -> List[int]:
+        """
+        Get the negative numbers, in input order.
+
+        Returns:
+            List[int]: The negative numbers.
+        """
+        if not self.negative_count:
+            return []
+        return [num for num in self.values if num < 0]
+
+    def sum(self, upper_limit: int = 1000, validator: INumberValidator = None) -> int:
+        """
+        Validate and sum the packed values as StringCalculator.add would.
+
+        The built-in validators are applied from the counts gathered when packing.
+        Any other validator receives all the values as a list.
+
+        Args:
+            upper_limit (int, optional): Numbers greater than this are ignored. Defaults to 1000.
+            validator (INumberValidator, optional): The validator to apply to the values.
+                Defaults to NegativeNumberValidator.
+
+        Returns:
+            int: The sum of the values up to the upper limit.
+
+        Raises:
+            ValueError: If the validator rejects the values.
+        """
+        rejects_negatives = _rejects_negatives(validator) if validator is not None else True
+        if rejects_negatives is None:
+            validator.validate(self.values.tolist())
+        elif rejects_negatives and self.negative_count:
+            # The negative numbers were counted when packing: only look for them if any
+            NegativeNumberValidator().validate(self.negative_numbers())
+
+        if self.maximum <= upper_limit:
+            return sum(self.values)
+        return sum(filter(upper_limit.__ge__, self.values))
+
+
+def cached_sum(path: str, upper_limit: int = 1000, validator: INumberValidator = None,
+               sidecar_path: str = None, verify_checksum: bool = False) -> int:
+    """
+    Sum an input file through its sidecar, building or rebuilding the sidecar when needed.
+
+    A sidecar that is out of date, damaged or of another version is rebuilt.
+
+    Args:
+        path (str): The input file, plain or compressed.
+        upper_limit (int, optional): Numbers greater than this are ignored. Defaults to 1000.
+        validator (INumberValidator, optional): The validator to apply to the values.
+            Defaults to NegativeNumberValidator.
+        sidecar_path (str, optional): The sidecar file. Defaults to sidecar_path_for(path).
+        verify_checksum (bool, optional): Whether to hash the input file to check the
+            sidecar. Defaults to False.
+
+    Returns:
+        int: The sum of the numbers up to the upper limit.
+    """
+    sidecar_path = sidecar_path or sidecar_path_for(path)
+    if os.path.exists(sidecar_path):
+        try:
+            packed = PackedValues(sidecar_path)
+        except ValueError:
+            # A sidecar of another version or a damaged one is stale: rebuild it
+            packed = None
+        if packed is not None:
+            with packed:
+                if packed.is_fresh(path, verify_checksum):
+                    return packed.sum(upper_limit, validator)
+    build_sidecar(path, sidecar_path)
+    with PackedValues(sidecar_path) as packed:
+        return packed.sum(upper_limit, validator)
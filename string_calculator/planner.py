@@ -0,0 +1,242 @@
+"""
+Engine planning for the String Calculator.
+
+The planner chooses the execution engine of StringCalculator.add from the
+input format and the size of the numbers after the header line, using
+thresholds stored in a small calibration profile.
+"""
+import json
+import os
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
+
+from string_calculator.engines import PARALLEL, PER_TOKEN, SCANNER, VECTORIZED
+
+PROFILE_ENV_VAR = 'STRING_CALCULATOR_PROFILE'
+DEFAULT_PROFILE_PATH = os.path.join(os.path.expanduser('~'), '.string_calculator_profile.json')
+THRESHOLD_FIELDS = ('scanner_threshold', 'vectorized_threshold', 'parallel_threshold')
+
+
+class CalibrationProfile:
+    """
+    Input size thresholds, in characters, at which each engine takes over.
+
+    A threshold of None means the engine is never chosen. Input formats can have
+    their own thresholds, as a header with several delimiters makes every engine
+    pay for one more pass over the numbers.
+    """
+
+    def __init__(self, scanner_threshold: Optional[int] = 64,
+                 vectorized_threshold: Optional[int] = 65536,
+                 parallel_threshold: Optional[int] = None,
+                 workers: int = 1,
+                 format_thresholds: Dict[str, Dict[str, Optional[int]]] = None):
+        """
+        Initialize the profile.
+
+        Args:
+            scanner_threshold (int, optional): Smallest input run by the scanner engine.
+                Defaults to 64.
+            vectorized_threshold (int, optional): Smallest input run by the vectorized engine.
+                Defaults to 65536.
+            parallel_threshold (int, optional): Smallest input run by the parallel engine.
+                Defaults to None.
+            workers (int, optional): The number of workers of the parallel engine. Defaults to 1.
+            format_thresholds (Dict[str, Dict[str, Optional[int]]], optional): Thresholds by
+                input format ('default', 'custom', 'long' or 'multiple'), overriding the
+                ones above. Defaults to none.
+        """
+        self.scanner_threshold = scanner_threshold
+        self.vectorized_threshold = vectorized_threshold
+        self.parallel_threshold = parallel_threshold
+        self.workers = workers
+        self.format_thresholds = format_thresholds or {}
+
+    def thresholds(self, input_format: str = None) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """
+        Get the thresholds of an input format.
+
+        Args:
+            input_format (str, optional): The input format. Defaults to none, for the
+                thresholds shared by every format.
+
+        Returns:
+            Tuple[Optional[int], Optional[int], Optional[int]]: The scanner, vectorized and
+                parallel thresholds.
+        """
+        overrides = self.format_thresholds.get(input_format, {})
+        return tuple(overrides.get(field, getattr(self, field)) for field in THRESHOLD_FIELDS)
+
+    def to_dict(self) -> Dict[str, Optional[int]]:
+        """
+        Convert the profile to a JSON-compatible dictionary.
+
+        Returns:
+            Dict[str, Optional[int]]: The profile fields.
+        """
+        return {
+            'scanner_threshold': self.scanner_threshold,
+            'vectorized_threshold': self.vectorized_threshold,
+            'parallel_threshold': self.parallel_threshold,
+            'workers': self.workers,
+            'format_thresholds': {
+                input_format: dict(thresholds)
+                for input_format, thresholds in self.format_thresholds.items()
+            },
+        }
+
+    def save(self, path: str = None) -> str:
+        """
+        Save the profile as JSON.
+
+        Args:
+            path (str, optional): The file to write. Defaults to default_profile_path().
+
+        Returns:
+            str: The path of the written file.
+        """
+        path = path or default_profile_path()
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as profile_file:
+            json.dump(self.to_dict(), profile_file, indent=2)
+        os.replace(temporary_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path: str = None) -> 'CalibrationProfile':
+        """
+        Load a saved profile, falling back to the default thresholds.
+
+        The profile is only a tuning cache: a missing, unreadable or malformed file
+        gives the default profile, unknown keys are ignored and fields that are not
+        integers keep their default value, as do malformed thresholds by format.
+
+        Args:
+            path (str, optional): The file to read. Defaults to default_profile_path().
+
+        Returns:
+            CalibrationProfile: The saved profile, or the default one if there is none.
+        """
+        path = path or default_profile_path()
+        try:
+            fields = _read_profile(path, os.stat(path).st_mtime_ns)
+        except (OSError, ValueError):
+            return cls()
+        if not isinstance(fields, dict):
+            return cls()
+        known_fields = cls().to_dict()
+        format_thresholds = fields.get('format_thresholds')
+        if isinstance(format_thresholds, dict):
+            format_thresholds = {
+                input_format: {
+                    key: value for key, value in thresholds.items()
+                    if key in THRESHOLD_FIELDS and (value is None or type(value) is int)
+                }
+                for input_format, thresholds in format_thresholds.items()
+                if isinstance(thresholds, dict)
+            }
+        else:
+            format_thresholds = None
+        return cls(format_thresholds=format_thresholds, **{
+            key: value for key, value in fields.items()
+            if key in known_fields and key != 'format_thresholds'
+            and (value is None or type(value) is int)
+            and (key != 'workers' or (value is not None and value > 0))
+        })
+
+    def __repr__(self):
+        fields = ", ".join(f"{key}={value}" for key, value in self.to_dict().items())
+        return f"CalibrationProfile({fields})"
+
+
+@lru_cache(maxsize=8)
+def _read_profile(path: str, mtime: int) -> Dict[str, Optional[int]]:
+    """
+    Read a profile file once per modification time.
+
+    Args:
+        path (str): The profile file.
+        mtime (int): Its modification time, only used as part of the cache key.
+
+    Returns:
+        Dict[str, Optional[int]]: The profile fields.
+    """
+    with open(path, encoding='utf-8') as profile_file:
+        return json.load(profile_file)
+
+
+def default_profile_path() -> str:
+    """
+    Get the location of the calibration profile.
+
+    Returns:
+        str: The $STRING_CALCULATOR_PROFILE path, or ~/.string_calculator_profile.json.
+    """
+    return os.environ.get(PROFILE_ENV_VAR, DEFAULT_PROFILE_PATH)
+
+
+class EnginePlanner:
+    """
+    Chooses the engine used by StringCalculator.add and counts its choices.
+    """
+
+    def __init__(self, profile: CalibrationProfile = None,
+                 listener: Callable[[str, int], None] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            profile (CalibrationProfile, optional): The thresholds to use.
+                Defaults to the saved profile, or the default thresholds if there is none.
+            listener (Callable[[str, int], None], optional): Called with the engine name and
+                the input size every time an engine is chosen.
+        """
+        self.profile = profile if profile is not None else CalibrationProfile.load()
+        self.listener = listener
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    def plan(self, size: int, input_format: str = None) -> str:
+        """
+        Choose the engine for an input of the given size and format.
+
+        Args:
+            size (int): The length of the numbers, after the header line if there is one.
+            input_format (str, optional): The input format, 'default', 'custom', 'long' or
+                'multiple'. Defaults to none, for the thresholds shared by every format.
+
+        Returns:
+            str: One of the engine names of string_calculator.engines.
+        """
+        engine = PER_TOKEN
+        for threshold, candidate in zip(self.profile.thresholds(input_format),
+                                        (SCANNER, VECTORIZED, PARALLEL)):
+            if threshold is not None and size >= threshold:
+                engine = candidate
+        return engine
+
+    def record(self, engine: str, size: int) -> None:
+        """
+        Record the engine that ran an input.
+
+        Args:
+            engine (str): The engine name.
+            size (int): The length of the input string.
+        """
+        with self._lock:
+            self._counts[engine] += 1
+        if self.listener is not None:
+            self.listener(engine, size)
+
+    @property
+    def counts(self) -> Dict[str, int]:
+        """
+        Get how many inputs each engine ran.
+
+        Returns:
+            Dict[str, int]: The number of runs by engine name.
+        """
+        with self._lock:
+            return dict(self._counts)
@@ -0,0 +1,296 @@
+"""
+Streaming input support for the String Calculator.
+
+This module parses an input that arrives in chunks, such as a large file,
+without holding more than one chunk and one partial number in memory.
+"""
+from typing import Iterable, Iterator, List
+
+from string_calculator.compression import compression_opener, iter_decompressed_chunks
+from string_calculator.implementations import DefaultInputParser, DelimiterCuts
+
+
+def iter_file_chunks(path: str, chunk_size: int = 1 << 20) -> Iterator[str]:
+    """
+    Read a text file in chunks.
+
+    Files compressed with gzip, bz2 or xz/lzma are detected from their first
+    bytes and decompressed in a producer thread while the chunks are parsed.
+
+    Args:
+        path (str): The file to read.
+        chunk_size (int, optional): The number of characters per chunk, or of decompressed
+            bytes for compressed files. Defaults to 1 MiB.
+
+    Yields:
+        str: Consecutive chunks of the file, with line endings preserved.
+    """
+    if compression_opener(path) is not None:
+        yield from iter_decompressed_chunks(path, chunk_size)
+        return
+    with open(path, encoding='utf-8', newline='') as input_file:
+        while True:
+            chunk = input_file.read(chunk_size)
+            if not chunk:
+                return
+            yield chunk
+
+
+class StreamTokenizer:
+    """
+    Incremental parser giving the same numbers as DefaultInputParser.parse.
+
+    The header line selects the delimiter strategy. The body is then cut at the
+    last position found by DelimiterCuts, so that every complete part parses on
+    its own exactly as it would inside the whole input. The unparsed tail is
+    carried to the next chunk.
+
+    DefaultInputParser selects the strategy from the square brackets of the
+    whole input, so brackets in the body can change it, and malformed numbers
+    are only reported at close, once all the brackets are known. If no part of
+    the body was cut, close parses the whole input with the parser and gives
+    exactly its result. Otherwise, if the brackets of the body select another
+    strategy than the header, close raises a ValueError: add rejects such
+    inputs as well, but its message may differ.
+    """
+
+    def __init__(self, parser: DefaultInputParser, header: str = None, pending: str = '',
+                 parsed_body: bool = False):
+        """
+        Initialize the tokenizer, optionally in the state saved by a checkpoint.
+
+        Args:
+            parser (DefaultInputParser): The parser whose strategies are used.
+            header (str, optional): The header line already read, or '' for an input
+                without one. Defaults to None, meaning not read yet.
+            pending (str, optional): Text already read but not parsed yet. Defaults to ''.
+            parsed_body (bool, optional): Whether part of the body before the pending text
+                has already been parsed, without brackets or malformed numbers.
+                Defaults to False.
+        """
+        self.parser = parser
+        self.header = None
+        self.strategy = None
+        self.cuts = None
+        self.parsed_body = parsed_body
+        # The unparsed text, kept as a list of pieces so that appending a chunk
+        # does not copy the text already pending
+        self._pieces = [pending] if pending else []
+        self._length = len(pending)
+        self._open_brackets = self._close_brackets = 0
+        self._error = None
+        if header is not None:
+            self._set_header(header)
+            self._count_brackets(pending)
+
+    @property
+    def pending(self) -> str:
+        """
+        Get the text read but not parsed yet.
+
+        Returns:
+            str: The unparsed text.
+        """
+        if len(self._pieces) > 1:
+            self._pieces = ["".join(self._pieces)]
+        return self._pieces[0] if self._pieces else ''
+
+    @pending.setter
+    def pending(self, text: str) -> None:
+        self._pieces = [text] if text else []
+        self._length = len(text)
+
+    @property
+    def resumable(self) -> bool:
+        """
+        Check whether the header and the pending text are enough to resume the stream.
+
+        Returns:
+            bool: False once the body holds a bracket or a malformed number.
+        """
+        return self._error is None and not self._open_brackets and not self._close_brackets
+
+    def feed(self, chunk: str) -> List[int]:
+        """
+        Parse the next chunk of the input.
+
+        Only the new chunk and the end of the pending text that a delimiter can
+        span are searched for a cut, so every character is searched a bounded
+        number of times.
+
+        Args:
+            chunk (str): The next chunk of the input string.
+
+        Returns:
+            List[int]: The numbers completed by this chunk.
+
+        Raises:
+            ValueError: If a number is malformed in an input without a header.
+        """
+        if not chunk:
+            return []
+        if self._error is not None:
+            # The input is invalid: only its brackets can still change the error
+            self._count_brackets(chunk)
+            return []
+        if self.header is None:
+            self._append(chunk)
+            if not self._read_header(chunk):
+                return []
+            text, start = self.pending, 0
+            self._count_brackets(text)
+        else:
+            # Also search the characters before the chunk that a delimiter can span,
+            # and the one before them
+            tail = self._tail(self.cuts.overlap + 1)
+            text, start = tail + chunk, self._length - len(tail)
+            self._count_brackets(chunk)
+            self._append(chunk)
+
+        cut = self.cuts.last(text)
+        if cut <= 0 or start + cut <= 0:
+            return []
+        pending = self.pending
+        complete, self.pending = pending[:start + cut], pending[start + cut:]
+        self.parsed_body = True
+        try:
+            return self._parse(complete)
+        except ValueError as error:
+            if not self.header:
+                raise
+            self._error = error
+            self.pending = ''
+            return []
+
+    def close(self) -> List[int]:
+        """
+        Parse the rest of the input once the stream is exhausted.
+
+        Returns:
+            List[int]: The remaining numbers.
+
+        Raises:
+            ValueError: If a number is malformed, or the brackets of the body change
+                the strategy selected from the header.
+        """
+        if not self.parsed_body:
+            # The whole input is still pending: parse it exactly as the parser does
+            numbers = self.parser.parse((self.header or '') + self.pending)
+        else:
+            self._check_strategy()
+            if self._error is not None:
+                raise self._error
+            numbers = self._parse(self.pending)
+        self.pending = ''
+        return numbers
+
+    def _count_brackets(self, text: str) -> None:
+        """Count the brackets of body text that can change the strategy of the header."""
+        if self.header:
+            self._open_brackets += text.count('[')
+            self._close_brackets += text.count(']')
+
+    def _check_strategy(self) -> None:
+        """
+        Check that the brackets of the body keep the strategy selected from the header.
+
+        The strategies read their delimiters from the header line, except the long
+        delimiter strategy, which is only selected from a header holding both brackets.
+
+        Raises:
+            ValueError: If the whole input selects another strategy.
+        """
+        if not self._open_brackets and not self._close_brackets:
+            return
+        # Only the number of brackets matters, up to telling one from several
+        brackets = '[' * min(self._open_brackets, 2) + ']' * min(self._close_brackets, 2)
+        if self.parser.select_strategy(self.header + brackets) is not self.strategy:
+            raise ValueError("square brackets in the numbers change the delimiters of the header")
+
+    def _append(self, chunk: str) -> None:
+        """Add a chunk to the pending text."""
+        self._pieces.append(chunk)
+        self._length += len(chunk)
+
+    def _tail(self, length: int) -> str:
+        """Get the last length characters of the pending text."""
+        tail = ''
+        for piece in reversed(self._pieces):
+            if len(tail) >= length:
+                break
+            tail = piece[len(tail) - length:] + tail
+        return tail
+
+    def _read_header(self, chunk: str) -> bool:
+        """
+        Select the delimiter strategy once the header line is available.
+
+        Args:
+            chunk (str): The chunk just added to the pending text.
+
+        Returns:
+            bool: True if the header has been read.
+        """
+        if self._length > len(chunk) and '\n' not in chunk and self._pieces[0].startswith('//'):
+            # Still inside a long header line
+            return False
+        pending = self.pending
+        if pending.startswith('//'):
+            newline = pending.find('\n')
+            if newline == -1:
+                return False
+            header, self.pending = pending[:newline + 1], pending[newline + 1:]
+        elif len(pending) >= 2 or not '//'.startswith(pending):
+            header = ''
+        else:
+            return False
+
+        self._set_header(header)
+        return True
+
+    def _set_header(self, header: str) -> None:
+        """
+        Select the delimiter strategy of a header line.
+
+        Args:
+            header (str): The header line, or '' for an input without one.
+        """
+        self.header = header
+        self.strategy = self.parser.select_strategy(header)
+        self.cuts = DelimiterCuts(self.strategy.extract_delimiters(header) + ['\n'])
+
+    def _parse(self, text: str) -> List[int]:
+        """
+        Parse a complete part of the body.
+
+        Args:
+            text (str): Body text that ends on a number boundary.
+
+        Returns:
+            List[int]: The numbers of the part.
+        """
+        if not text:
+            return []
+        delimiter, numbers_str = self.strategy.extract_delimiter_and_numbers(self.header + text)
+        return [int(num) for num in numbers_str.split(delimiter) if num]
+
+
+def iter_numbers(parser: DefaultInputParser, chunks: Iterable[str]) -> Iterator[List[int]]:
+    """
+    Parse a chunked input into batches of numbers.
+
+    Args:
+        parser (DefaultInputParser): The parser whose strategies are used.
+        chunks (Iterable[str]): Consecutive chunks of the input string.
+
+    Yields:
+        List[int]: The numbers, in input order, in batches.
+    """
+    tokenizer = StreamTokenizer(parser)
+    for chunk in chunks:
+        numbers = tokenizer.feed(chunk)
+        if numbers:
+            yield numbers
+    numbers = tokenizer.close()
+    if numbers:
+        yield numbers
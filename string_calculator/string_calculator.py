@@ -3,16 +3,32 @@ String Calculator module.
 
 This module implements a string calculator that follows the TDD Kata requirements.
 """
+from concurrent.futures import ThreadPoolExecutor
+
 from string_calculator.interfaces import IInputParser, INumberValidator
 from string_calculator.implementations import (
     DefaultInputParser,
-    StandardDelimiterStrategy,
-    CustomDelimiterStrategy,
-    LongDelimiterStrategy,
-    MultipleDelimiterStrategy,
     NegativeNumberValidator,
     UpperLimitNumberValidator,
-    CompositeValidator
+    CompositeValidator,
+    create_default_parser
+)
+from string_calculator.engines import (
+    PER_TOKEN,
+    SCANNER,
+    VECTORIZED,
+    scan_sum,
+    vectorized_sum,
+    parallel_sum
+)
+from string_calculator.planner import EnginePlanner
+from string_calculator.aggregates import Aggregator, SUM
+from string_calculator.streaming import iter_file_chunks, iter_numbers
+from string_calculator.checkpoint import (
+    Checkpoint,
+    add_file_with_checkpoints,
+    add_stream_with_checkpoints,
+    load_stream_checkpoint
 )
 
 
@@ -26,12 +42,17 @@ class StringCalculator:
     
     This class follows the Dependency Inversion Principle by depending on abstractions
     rather than concrete implementations.
+    
+    A calculator built from the default parser, strategies and validators holds no
+    mutable state besides the thread-safe planner counters, so a single instance can
+    be shared by any number of threads.
     """
     
     def __init__(
         self,
         parser: IInputParser = None,
-        validator: INumberValidator = None
+        validator: INumberValidator = None,
+        planner: EnginePlanner = None
     ):
         """
         Initialize the StringCalculator with its dependencies.
@@ -41,19 +62,12 @@ class StringCalculator:
                 Defaults to DefaultInputParser with standard strategies.
             validator (INumberValidator, optional): The validator to use for numbers.
                 Defaults to NegativeNumberValidator.
+            planner (EnginePlanner, optional): Chooses the engine that runs each input.
+                Defaults to an EnginePlanner using the saved calibration profile.
         """
         # If no parser is provided, create a default one
         if parser is None:
-            standard_strategy = StandardDelimiterStrategy()
-            custom_strategy = CustomDelimiterStrategy()
-            long_delimiter_strategy = LongDelimiterStrategy()
-            multiple_delimiter_strategy = MultipleDelimiterStrategy()
-            parser = DefaultInputParser(
-                standard_strategy,
-                custom_strategy,
-                long_delimiter_strategy,
-                multiple_delimiter_strategy
-            )
+            parser = create_default_parser()
         
         # If no validator is provided, create a composite validator
         if validator is None:
@@ -63,6 +77,7 @@ class StringCalculator:
         
         self.parser = parser
         self.validator = validator
+        self.planner = planner if planner is not None else EnginePlanner()
     
     def add(self, numbers_str):
         """
@@ -79,13 +94,303 @@ class StringCalculator:
         if not numbers_str:
             return 0
         
-        # Parse the input to get the numbers
-        numbers = self.parser.parse(numbers_str)
+        engine = self.plan(numbers_str)
+        self.planner.record(engine, len(numbers_str))
+        return self.run_engine(engine, numbers_str)
+    
+    def add_many(self, inputs, max_workers=None):
+        """
+        Add the numbers of several strings concurrently.
+        
+        The strings are spread over a thread pool. Threads only run Python code in
+        parallel on free-threaded interpreters (e.g. CPython 3.13t); with the GIL
+        the results are the same but the speedup is limited.
+        
+        Args:
+            inputs (Iterable[str]): The strings to add.
+            max_workers (int, optional): The number of threads. Defaults to the
+                ThreadPoolExecutor default.
+            
+        Returns:
+            List[int]: The sum of every string, in input order.
+            
+        Raises:
+            ValueError: The error of the first failing string, in input order.
+        """
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.add, inputs))
+    
+    def plan(self, numbers_str):
+        """
+        Choose the engine that add would use for an input.
+        
+        The fast engines re-implement the default parser and validators, so they
+        are only chosen when the calculator uses them. The planner is given the
+        input format and the length of the numbers after the header line.
+        
+        Args:
+            numbers_str (str): A string containing numbers separated by delimiters.
+            
+        Returns:
+            str: One of the engine names of string_calculator.engines.
+        """
+        if not self._uses_default_rules():
+            return PER_TOKEN
+        strategy = self.parser.select_strategy(numbers_str)
+        if strategy is self.parser.standard_strategy:
+            return self.planner.plan(len(numbers_str), 'default')
+        
+        if strategy is self.parser.multiple_delimiter_strategy:
+            input_format = 'multiple'
+        elif strategy is self.parser.long_delimiter_strategy:
+            input_format = 'long'
+        else:
+            input_format = 'custom'
+        # The numbers start after the header line
+        return self.planner.plan(len(numbers_str) - numbers_str.find('\n') - 1, input_format)
+    
+    def run_engine(self, engine, numbers_str):
+        """
+        Add numbers with the given engine.
+        
+        The engine is not checked against the parser and validator: the fast
+        engines only give the result of add for the engines returned by plan.
+        
+        Args:
+            engine (str): One of the engine names of string_calculator.engines.
+            numbers_str (str): A non-empty string containing numbers separated by delimiters.
+            
+        Returns:
+            int: The sum of the numbers.
+        """
+        if engine == PER_TOKEN:
+            # Parse the input to get the numbers
+            numbers = self.parser.parse(numbers_str)
+            
+            # Validate numbers
+            self.validator.validate(numbers)
+            
+            # Filter out numbers greater than 1000
+            filtered_numbers = [num for num in numbers if num <= 1000]
+            
+            return sum(filtered_numbers)
+        
+        strategy = self.parser.select_strategy(numbers_str)
+        delimiter, body = strategy.extract_delimiter_and_numbers(numbers_str)
+        if engine == SCANNER:
+            return scan_sum(body, delimiter)
+        if engine == VECTORIZED:
+            return vectorized_sum(body, delimiter)
+        return parallel_sum(body, delimiter, workers=self.planner.profile.workers)
+    
+    def _uses_default_rules(self):
+        """
+        Check whether the parser and validator are the default implementations.
+        
+        Returns:
+            bool: True if the fast engines give the same results as the configured ones.
+        """
+        if type(self.parser) is not DefaultInputParser or type(self.validator) is not CompositeValidator:
+            return False
+        validator_types = [type(validator) for validator in self.validator.validators]
+        return (
+            NegativeNumberValidator in validator_types
+            and all(validator_type in (NegativeNumberValidator, UpperLimitNumberValidator)
+                    for validator_type in validator_types)
+        )
+    
+    def aggregate(self, numbers_str, ops=(SUM,), bucket_width=100):
+        """
+        Compute several aggregates of the numbers with a single parse.
+        
+        The same negative and upper-limit rules as add apply: count, min, max,
+        mean and histogram only see the numbers that add would sum.
+        
+        Args:
+            numbers_str (str): A string containing numbers separated by delimiters.
+            ops (Sequence[str], optional): The aggregates to compute, among 'sum', 'count',
+                'min', 'max', 'mean' and 'histogram'. Defaults to ('sum',).
+            bucket_width (int, optional): The width of the histogram buckets. Defaults to 100.
+            
+        Returns:
+            Dict[str, object]: The value of every requested aggregate, by name.
+        """
+        aggregator = Aggregator(ops, bucket_width)
+        if numbers_str:
+            numbers = self.parser.parse(numbers_str)
+            self.validator.validate(numbers)
+            aggregator.update([num for num in numbers if num <= 1000])
+        return aggregator.result()
+    
+    def aggregate_stream(self, chunks, ops=(SUM,), bucket_width=100):
+        """
+        Compute several aggregates of an input that arrives in chunks.
         
-        # Validate numbers
-        self.validator.validate(numbers)
+        Args:
+            chunks (Iterable[str]): Consecutive chunks of the input string.
+            ops (Sequence[str], optional): The aggregates to compute. Defaults to ('sum',).
+            bucket_width (int, optional): The width of the histogram buckets. Defaults to 100.
+            
+        Returns:
+            Dict[str, object]: The value of every requested aggregate, by name.
+        """
+        aggregator = Aggregator(ops, bucket_width)
+        aggregator.update_all(self._iter_valid_numbers(chunks))
+        return aggregator.result()
+    
+    def aggregate_file(self, path, ops=(SUM,), bucket_width=100, chunk_size=1 << 20):
+        """
+        Compute several aggregates of the input stored in a file.
+        
+        Args:
+            path (str): The file holding the input string.
+            ops (Sequence[str], optional): The aggregates to compute. Defaults to ('sum',).
+            bucket_width (int, optional): The width of the histogram buckets. Defaults to 100.
+            chunk_size (int, optional): The number of characters read at once. Defaults to 1 MiB.
+            
+        Returns:
+            Dict[str, object]: The value of every requested aggregate, by name.
+        """
+        return self.aggregate_stream(iter_file_chunks(path, chunk_size), ops, bucket_width)
+    
+    def add_stream(self, chunks, checkpoint_path=None, checkpoint_every=64 << 20):
+        """
+        Add numbers provided as a string that arrives in chunks.
+        
+        Args:
+            chunks (Iterable[str]): Consecutive chunks of the input string.
+            checkpoint_path (str, optional): Where to save periodic checkpoints, so that an
+                interrupted run can be continued with resume_stream. Defaults to no checkpoints.
+            checkpoint_every (int, optional): The number of characters between checkpoints.
+                Defaults to 64 Mi characters.
+            
+        Returns:
+            int: The sum of the numbers.
+        """
+        if checkpoint_path is not None:
+            return add_stream_with_checkpoints(self, chunks, checkpoint_path, None, checkpoint_every)
+        return self.aggregate_stream(chunks)[SUM]
+    
+    def stream_offset(self, checkpoint_path):
+        """
+        Get the character offset from which an interrupted add_stream run resumes.
+        
+        Args:
+            checkpoint_path (str): The checkpoint file given to add_stream.
+            
+        Returns:
+            int: The number of characters of the stream to skip when replaying it,
+                0 if there is no usable checkpoint.
+        """
+        return load_stream_checkpoint(checkpoint_path).offset
+    
+    def resume_stream(self, chunks, checkpoint_path, checkpoint_every=64 << 20):
+        """
+        Continue an interrupted add_stream run from its last checkpoint.
+        
+        The chunks must replay the stream from stream_offset(checkpoint_path) on.
+        The result is the same as the one of an uninterrupted run.
+        
+        Args:
+            chunks (Iterable[str]): Consecutive chunks of the input string, starting at
+                the offset returned by stream_offset.
+            checkpoint_path (str): The checkpoint file given to add_stream.
+            checkpoint_every (int, optional): The number of characters between checkpoints.
+                Defaults to 64 Mi characters.
+            
+        Returns:
+            int: The sum of the numbers.
+        """
+        return add_stream_with_checkpoints(self, chunks, checkpoint_path,
+                                           load_stream_checkpoint(checkpoint_path),
+                                           checkpoint_every)
+    
+    def add_file(self, path, chunk_size=1 << 20, checkpoint_path=None, checkpoint_every=64 << 20):
+        """
+        Add numbers provided as a string stored in a file.
+        
+        Args:
+            path (str): The file holding the input string.
+            chunk_size (int, optional): The number of characters, or bytes when saving
+                checkpoints, read at once. Defaults to 1 MiB.
+            checkpoint_path (str, optional): Where to save periodic checkpoints, so that an
+                interrupted run can be continued with resume_file. Defaults to no checkpoints.
+            checkpoint_every (int, optional): The number of bytes between checkpoints.
+                Defaults to 64 MiB.
+            
+        Returns:
+            int: The sum of the numbers.
+        """
+        if checkpoint_path is not None:
+            return add_file_with_checkpoints(self, path, checkpoint_path, None,
+                                             chunk_size, checkpoint_every)
+        return self.add_stream(iter_file_chunks(path, chunk_size))
+    
+    def resume_file(self, path, checkpoint_path, chunk_size=1 << 20, checkpoint_every=64 << 20):
+        """
+        Continue an interrupted add_file run from its last checkpoint.
+        
+        The result is the same as the one of an uninterrupted run. If there is no
+        checkpoint, it cannot be read, or it does not match the current size and
+        modification time of the file, the file is summed from the start.
+        
+        Args:
+            path (str): The file holding the input string.
+            checkpoint_path (str): The checkpoint file given to add_file.
+            chunk_size (int, optional): The number of bytes read at once. Defaults to 1 MiB.
+            checkpoint_every (int, optional): The number of bytes between checkpoints.
+                Defaults to 64 MiB.
+            
+        Returns:
+            int: The sum of the numbers.
+        """
+        return add_file_with_checkpoints(self, path, checkpoint_path, Checkpoint.load(checkpoint_path),
+                                         chunk_size, checkpoint_every)
+    
+    def validate_batch(self, numbers, negative_numbers):
+        """
+        Validate and filter one batch of a chunked input.
+        
+        Negative numbers are not validated yet but moved to negative_numbers. Once
+        the whole input has been read, the caller validates them together with
+        self.validator, so that they are reported exactly as add reports them.
+        
+        Args:
+            numbers (List[int]): The numbers of the batch.
+            negative_numbers (List[int]): The negative numbers seen so far, extended in place.
+            
+        Returns:
+            List[int]: The numbers that add would sum.
+        """
+        if numbers and min(numbers) < 0:
+            negative_numbers.extend(num for num in numbers if num < 0)
+            self.validator.validate([num for num in numbers if num >= 0])
+        else:
+            self.validator.validate(numbers)
+        return [num for num in numbers if num <= 1000]
+    
+    def _iter_valid_numbers(self, chunks):
+        """
+        Parse, validate and filter a chunked input batch by batch.
+        
+        The validator sees the non-negative numbers of every batch, then all the
+        negative numbers at the end, so that negative numbers are reported together
+        exactly as add reports them.
+        
+        Args:
+            chunks (Iterable[str]): Consecutive chunks of the input string.
+            
+        Yields:
+            List[int]: The numbers that add would sum, in batches.
+        """
+        if type(self.parser) is DefaultInputParser:
+            batches = iter_numbers(self.parser, chunks)
+        else:
+            # Other parsers can only parse whole strings
+            batches = [self.parser.parse("".join(chunks))]
         
-        # Filter out numbers greater than 1000
-        filtered_numbers = [num for num in numbers if num <= 1000]
+        negative_numbers = []
+        for numbers in batches:
+            yield self.validate_batch(numbers, negative_numbers)
         
-        return sum(filtered_numbers)
\ No newline at end of file
+        self.validator.validate(negative_numbers)
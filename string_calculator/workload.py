@@ -0,0 +1,203 @@
+"""
+Synthetic workload generation for the String Calculator.
+
+This module deterministically generates calculator inputs of any size in every
+format understood by DefaultInputParser, so that alternative engines can be
+validated and benchmarked against realistic data.
+"""
+import random
+from typing import Iterator, List
+
+# Characters that can safely be used in generated delimiters: no digits, no
+# sign characters, no whitespace, no brackets and nothing that appears in the
+# MultipleDelimiterStrategy marker.
+DELIMITER_ALPHABET = "*%;|#&@!$^~=:?."
+
+INPUT_FORMATS = ('default', 'custom', 'long', 'multiple')
+
+
+class WorkloadSpec:
+    """
+    Description of a synthetic calculator input.
+    """
+
+    def __init__(self, input_format: str = 'default', num_tokens: int = 1000,
+                 negative_density: float = 0.0, over_limit_density: float = 0.0,
+                 token_length: int = 3, delimiter_count: int = 2,
+                 delimiter_length: int = 1, newline_density: float = 0.0,
+                 seed: int = 0):
+        """
+        Initialize the workload specification.
+
+        Args:
+            input_format (str, optional): One of 'default' ("1,2\\n3"), 'custom' ("//;\\n"),
+                'long' ("//[***]\\n") or 'multiple' ("//[*][%]\\n"). Defaults to 'default'.
+            num_tokens (int, optional): The number of numbers to generate. Defaults to 1000.
+            negative_density (float, optional): The fraction of negative numbers. Defaults to 0.0.
+            over_limit_density (float, optional): The fraction of numbers greater than 1000.
+                Defaults to 0.0.
+            token_length (int, optional): The maximum number of digits of an in-range number.
+                Defaults to 3.
+            delimiter_count (int, optional): The number of delimiters of the 'multiple' format.
+                Defaults to 2.
+            delimiter_length (int, optional): The length of the 'long' and 'multiple' delimiters.
+                Defaults to 1.
+            newline_density (float, optional): The fraction of separators that are newlines.
+                Defaults to 0.0.
+            seed (int, optional): The random seed. Defaults to 0.
+
+        Raises:
+            ValueError: If the specification cannot be generated.
+        """
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"unknown input format: {input_format}")
+        if num_tokens < 0:
+            raise ValueError("num_tokens must not be negative")
+        if token_length < 1 or delimiter_length < 1:
+            raise ValueError("token_length and delimiter_length must be positive")
+        if input_format == 'multiple' and not 2 <= delimiter_count <= len(DELIMITER_ALPHABET):
+            raise ValueError(
+                f"delimiter_count must be between 2 and {len(DELIMITER_ALPHABET)}"
+            )
+        if negative_density + over_limit_density > 1:
+            raise ValueError("negative_density and over_limit_density must not exceed 1 together")
+
+        self.input_format = input_format
+        self.num_tokens = num_tokens
+        self.negative_density = negative_density
+        self.over_limit_density = over_limit_density
+        self.token_length = token_length
+        self.delimiter_count = delimiter_count
+        self.delimiter_length = delimiter_length
+        self.newline_density = newline_density
+        self.seed = seed
+
+    def __repr__(self):
+        return (
+            f"WorkloadSpec(input_format={self.input_format!r}, num_tokens={self.num_tokens}, "
+            f"negative_density={self.negative_density}, "
+            f"over_limit_density={self.over_limit_density}, token_length={self.token_length}, "
+            f"delimiter_count={self.delimiter_count}, "
+            f"delimiter_length={self.delimiter_length}, "
+            f"newline_density={self.newline_density}, seed={self.seed})"
+        )
+
+
+def _choose_delimiters(spec: WorkloadSpec, rng: random.Random) -> List[str]:
+    """
+    Choose the delimiters of a workload.
+
+    Every delimiter is built from its own character so that no delimiter is a
+    substring of another one.
+
+    Args:
+        spec (WorkloadSpec): The workload specification.
+        rng (random.Random): The random generator.
+
+    Returns:
+        List[str]: The delimiters used between numbers.
+    """
+    if spec.input_format == 'default':
+        return [',']
+    if spec.input_format == 'custom':
+        return [rng.choice(DELIMITER_ALPHABET)]
+    count = spec.delimiter_count if spec.input_format == 'multiple' else 1
+    return [char * spec.delimiter_length for char in rng.sample(DELIMITER_ALPHABET, count)]
+
+
+def _header(spec: WorkloadSpec, delimiters: List[str]) -> str:
+    """
+    Build the delimiter header of a workload.
+
+    Args:
+        spec (WorkloadSpec): The workload specification.
+        delimiters (List[str]): The delimiters of the workload.
+
+    Returns:
+        str: The header, including its terminating newline.
+    """
+    if spec.input_format == 'default':
+        return ''
+    if spec.input_format == 'custom':
+        return f"//{delimiters[0]}\n"
+    return "//" + "".join(f"[{delimiter}]" for delimiter in delimiters) + "\n"
+
+
+def iter_workload(spec: WorkloadSpec, chunk_tokens: int = 4096) -> Iterator[str]:
+    """
+    Generate a workload as a stream of text chunks.
+
+    The same specification always produces the same text, and memory use is
+    bounded by chunk_tokens regardless of the total size.
+
+    Args:
+        spec (WorkloadSpec): The workload specification.
+        chunk_tokens (int, optional): The number of numbers per chunk. Defaults to 4096.
+
+    Yields:
+        str: Consecutive chunks of the input string.
+    """
+    rng = random.Random(spec.seed)
+    delimiters = _choose_delimiters(spec, rng)
+    header = _header(spec, delimiters)
+    if header:
+        yield header
+
+    in_range_max = min(1000, 10 ** spec.token_length - 1)
+    over_limit_max = max(1001, 10 ** max(spec.token_length, 4) - 1)
+    negative_max = 10 ** spec.token_length - 1
+
+    parts = []
+    for index in range(spec.num_tokens):
+        if index:
+            if rng.random() < spec.newline_density:
+                parts.append('\n')
+            else:
+                parts.append(rng.choice(delimiters))
+
+        roll = rng.random()
+        if roll < spec.negative_density:
+            parts.append(str(-rng.randint(1, negative_max)))
+        elif roll < spec.negative_density + spec.over_limit_density:
+            parts.append(str(rng.randint(1001, over_limit_max)))
+        else:
+            parts.append(str(rng.randint(0, in_range_max)))
+
+        if (index + 1) % chunk_tokens == 0:
+            yield "".join(parts)
+            parts = []
+
+    if parts:
+        yield "".join(parts)
+
+
+def generate_workload(spec: WorkloadSpec) -> str:
+    """
+    Generate a whole workload in memory.
+
+    Args:
+        spec (WorkloadSpec): The workload specification.
+
+    Returns:
+        str: The generated input string.
+    """
+    return "".join(iter_workload(spec))
+
+
+def write_workload(path: str, spec: WorkloadSpec, chunk_tokens: int = 4096) -> int:
+    """
+    Stream a workload to a file.
+
+    Args:
+        path (str): The file to write.
+        spec (WorkloadSpec): The workload specification.
+        chunk_tokens (int, optional): The number of numbers per chunk. Defaults to 4096.
+
+    Returns:
+        int: The number of characters written.
+    """
+    written = 0
+    with open(path, 'w', encoding='utf-8', newline='') as output:
+        for chunk in iter_workload(spec, chunk_tokens):
+            written += output.write(chunk)
+    return written
@@ -0,0 +1,95 @@
+"""
+Tests for the aggregates.
+"""
+import os
+import tempfile
+import unittest
+
+from string_calculator.aggregates import AGGREGATES, Aggregator
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import WorkloadSpec, generate_workload, write_workload
+
+
+class TestAggregator(unittest.TestCase):
+    """Test cases for the Aggregator class."""
+
+    def test_all_aggregates(self):
+        """Test every aggregate over several batches."""
+        aggregator = Aggregator(AGGREGATES, bucket_width=10)
+        aggregator.update([1, 12, 5])
+        aggregator.update([])
+        aggregator.update([30, 19])
+        self.assertEqual(
+            {'sum': 67, 'count': 5, 'min': 1, 'max': 30, 'mean': 13.4,
+             'histogram': {0: 2, 10: 2, 30: 1}},
+            aggregator.result()
+        )
+
+    def test_empty_input(self):
+        """Test the aggregates of an input without numbers."""
+        self.assertEqual(
+            {'sum': 0, 'count': 0, 'min': None, 'max': None, 'mean': None, 'histogram': {}},
+            Aggregator(AGGREGATES).result()
+        )
+
+    def test_invalid_arguments(self):
+        """Test that unknown aggregates and bucket widths are rejected."""
+        with self.assertRaises(ValueError):
+            Aggregator(['sum', 'median'])
+        with self.assertRaises(ValueError):
+            Aggregator(bucket_width=0)
+
+
+class TestCalculatorAggregates(unittest.TestCase):
+    """Test cases for the aggregate and streaming methods of StringCalculator."""
+
+    def setUp(self):
+        """Set up a new StringCalculator instance for each test."""
+        self.calculator = StringCalculator()
+
+    def test_aggregate(self):
+        """Test that aggregates follow the upper-limit rule of add."""
+        result = self.calculator.aggregate("//[*][%]\n1*2%1001\n3", ['sum', 'count', 'max', 'mean'])
+        self.assertEqual({'sum': 6, 'count': 3, 'max': 3, 'mean': 2}, result)
+        self.assertEqual({'sum': 0, 'count': 0}, self.calculator.aggregate("", ['sum', 'count']))
+
+    def test_aggregate_parses_once(self):
+        """Test that all aggregates are computed from a single parse."""
+        calls = []
+        parse = self.calculator.parser.parse
+        self.calculator.parser.parse = lambda input_str: calls.append(input_str) or parse(input_str)
+        self.calculator.aggregate("1,2,3", AGGREGATES)
+        self.assertEqual(1, len(calls))
+
+    def test_aggregate_negative_numbers(self):
+        """Test that negative numbers are rejected by every entry point."""
+        for aggregate in (lambda: self.calculator.aggregate("-1,2,-3", ['count']),
+                          lambda: self.calculator.aggregate_stream(["-1,", "2,-", "3"], ['count']),
+                          lambda: self.calculator.add_stream(["-1,", "2,-", "3"])):
+            with self.assertRaises(ValueError) as context:
+                aggregate()
+            self.assertEqual("negative numbers not allowed: -1, -3", str(context.exception))
+
+    def test_stream_matches_string(self):
+        """Test that streamed and whole inputs give the same aggregates."""
+        spec = WorkloadSpec('multiple', num_tokens=5000, over_limit_density=0.1, seed=2)
+        input_str = generate_workload(spec)
+        chunks = [input_str[start:start + 333] for start in range(0, len(input_str), 333)]
+        self.assertEqual(self.calculator.aggregate(input_str, AGGREGATES),
+                         self.calculator.aggregate_stream(chunks, AGGREGATES))
+        self.assertEqual(self.calculator.add(input_str), self.calculator.add_stream(chunks))
+
+    def test_file_matches_string(self):
+        """Test that file inputs give the same aggregates as strings."""
+        spec = WorkloadSpec('long', num_tokens=5000, delimiter_length=2, newline_density=0.1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            write_workload(path, spec)
+            self.assertEqual(self.calculator.aggregate(generate_workload(spec), AGGREGATES),
+                             self.calculator.aggregate_file(path, AGGREGATES, chunk_size=100))
+            self.assertEqual(self.calculator.add(generate_workload(spec)),
+                             self.calculator.add_file(path, chunk_size=100))
+
+
+if __name__ == "__main__":
+    unittest.main()
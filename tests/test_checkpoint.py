@@ -0,0 +1,240 @@
+"""
+Tests for checkpointed and resumed file sums.
+"""
+import json
+import os
+import tempfile
+import unittest
+
+from string_calculator.checkpoint import Checkpoint
+from string_calculator.implementations import CompositeValidator, NegativeNumberValidator
+from string_calculator.interfaces import INumberValidator
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload, write_workload
+
+
+class Crash(Exception):
+    """Simulated crash of a long-running sum."""
+
+
+class CrashingValidator(INumberValidator):
+    """Validator that crashes after validating a number of batches."""
+
+    def __init__(self, batches):
+        """Crash once the given number of batches has been validated."""
+        self.batches = batches
+
+    def validate(self, numbers):
+        """Count the batch and crash if there are no batches left."""
+        self.batches -= 1
+        if self.batches < 0:
+            raise Crash()
+
+
+class TestCheckpoint(unittest.TestCase):
+    """Test cases for checkpoints of StringCalculator.add_file."""
+
+    def setUp(self):
+        """Set up a temporary directory and a calculator for each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.input_path = os.path.join(self.directory.name, 'input.txt')
+        self.checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+        self.calculator = StringCalculator()
+
+    def crash_after(self, batches, chunk_size=100):
+        """Run a checkpointed sum that crashes after the given number of batches."""
+        crashing = StringCalculator(
+            validator=CompositeValidator([NegativeNumberValidator(), CrashingValidator(batches)])
+        )
+        with self.assertRaises(Crash):
+            crashing.add_file(self.input_path, chunk_size=chunk_size,
+                              checkpoint_path=self.checkpoint_path, checkpoint_every=250)
+
+    def test_save_and_load(self):
+        """Test that a saved checkpoint is loaded back."""
+        checkpoint = Checkpoint(10, 42, '//;\n', ';1', [-1])
+        checkpoint.save(self.checkpoint_path)
+        self.assertEqual(checkpoint.to_dict(), Checkpoint.load(self.checkpoint_path).to_dict())
+
+    def test_resume_gives_uninterrupted_result(self):
+        """Test that resuming after a crash gives the same sum for every format."""
+        for input_format in INPUT_FORMATS:
+            spec = WorkloadSpec(input_format, num_tokens=3000, delimiter_length=3,
+                                over_limit_density=0.1, newline_density=0.05)
+            write_workload(self.input_path, spec)
+            for batches in (4, 10, 20):
+                self.crash_after(batches)
+                self.assertTrue(os.path.exists(self.checkpoint_path))
+                self.assertEqual(self.calculator.add(generate_workload(spec)),
+                                 self.calculator.resume_file(self.input_path, self.checkpoint_path,
+                                                             chunk_size=77))
+                self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_checkpoint_is_at_a_delimiter_boundary(self):
+        """Test that checkpoints point at the start of a delimiter."""
+        spec = WorkloadSpec('long', num_tokens=2000, delimiter_length=2)
+        write_workload(self.input_path, spec)
+        self.crash_after(10)
+        checkpoint = Checkpoint.load(self.checkpoint_path)
+        with open(self.input_path, 'rb') as input_file:
+            contents = input_file.read()
+        delimiter = checkpoint.header[3:5].encode()
+        self.assertEqual(contents.split(b'\n')[0] + b'\n', checkpoint.header.encode())
+        self.assertEqual(delimiter, contents[checkpoint.offset:checkpoint.offset + 2])
+        self.assertTrue(contents[checkpoint.offset:].startswith(checkpoint.pending.encode()))
+
+    def test_resume_reports_all_negative_numbers(self):
+        """Test that negative numbers found before the crash are still reported."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("-1," + "1," * 500 + "-2,3")
+        self.crash_after(3, chunk_size=50)
+        with self.assertRaises(ValueError) as context:
+            self.calculator.resume_file(self.input_path, self.checkpoint_path)
+        self.assertEqual("negative numbers not allowed: -1, -2", str(context.exception))
+
+    def test_multibyte_delimiters(self):
+        """Test that byte offsets account for multi-byte characters."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("//[€]\n" + "€".join(str(num % 1000) for num in range(3000)))
+        self.crash_after(7, chunk_size=61)
+        self.assertEqual(sum(num % 1000 for num in range(3000)),
+                         self.calculator.resume_file(self.input_path, self.checkpoint_path))
+
+    def test_crlf_checkpoints_move_forward(self):
+        """Test that checkpoints of CRLF inputs advance and only hold the last number."""
+        with open(self.input_path, 'w', encoding='utf-8', newline='') as input_file:
+            input_file.write("5\r\n" * 20000)
+        self.crash_after(30)
+        checkpoint = Checkpoint.load(self.checkpoint_path)
+        self.assertGreater(checkpoint.offset, 2500)
+        self.assertLess(len(checkpoint.pending), 100)
+        self.assertEqual(100000, self.calculator.resume_file(self.input_path, self.checkpoint_path))
+
+    def test_stale_checkpoint_starts_over(self):
+        """Test that a checkpoint of a modified or another file is not resumed."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("1," * 2000 + "1")
+        self.crash_after(5)
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("2," * 2000 + "2")
+        stat = os.stat(self.input_path)
+        os.utime(self.input_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(4002, self.calculator.resume_file(self.input_path, self.checkpoint_path))
+
+        self.crash_after(5)
+        other_path = os.path.join(self.directory.name, 'other.txt')
+        with open(other_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("3," * 2000 + "3")
+        self.assertEqual(6003, self.calculator.resume_file(other_path, self.checkpoint_path))
+
+    def test_malformed_checkpoint_starts_over(self):
+        """Test that a corrupt or unexpected checkpoint file is not resumed."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("1," * 2000 + "1")
+        self.crash_after(5)
+        saved = Checkpoint.load(self.checkpoint_path)
+        self.assertTrue(saved.offset)
+        contents = [
+            '{"offset": 10, "tot',
+            '[1, 2]',
+            json.dumps(dict(saved.to_dict(), offset="10")),
+            json.dumps(dict(saved.to_dict(), negative_numbers=[1.5])),
+        ]
+        for content in contents:
+            with self.subTest(content=content):
+                with open(self.checkpoint_path, 'w', encoding='utf-8') as checkpoint_file:
+                    checkpoint_file.write(content)
+                self.assertEqual(Checkpoint().to_dict(), Checkpoint.load(self.checkpoint_path).to_dict())
+                self.assertEqual(2001, self.calculator.resume_file(self.input_path,
+                                                                   self.checkpoint_path))
+
+    def test_unknown_checkpoint_keys_are_ignored(self):
+        """Test that keys added by another version do not prevent resuming."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("1," * 2000 + "1")
+        self.crash_after(5)
+        saved = Checkpoint.load(self.checkpoint_path)
+        with open(self.checkpoint_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(dict(saved.to_dict(), format_version=2), checkpoint_file)
+        self.assertEqual(saved.to_dict(), Checkpoint.load(self.checkpoint_path).to_dict())
+        self.assertEqual(2001, self.calculator.resume_file(self.input_path, self.checkpoint_path))
+
+    def test_resume_without_checkpoint_starts_over(self):
+        """Test that resuming without a checkpoint sums the whole file."""
+        with open(self.input_path, 'w', encoding='utf-8') as input_file:
+            input_file.write("//;\n1;2\n3")
+        self.assertEqual(6, self.calculator.resume_file(self.input_path, self.checkpoint_path))
+
+
+def chunked(text, chunk_size):
+    """Split a string into chunks of the given size."""
+    return (text[start:start + chunk_size] for start in range(0, len(text), chunk_size))
+
+
+class TestStreamCheckpoint(unittest.TestCase):
+    """Test cases for checkpoints of StringCalculator.add_stream."""
+
+    def setUp(self):
+        """Set up a temporary directory and a calculator for each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+        self.calculator = StringCalculator()
+
+    def crash_after(self, text, batches, chunk_size=100):
+        """Run a checkpointed stream sum that crashes after the given number of batches."""
+        crashing = StringCalculator(
+            validator=CompositeValidator([NegativeNumberValidator(), CrashingValidator(batches)])
+        )
+        with self.assertRaises(Crash):
+            crashing.add_stream(chunked(text, chunk_size), checkpoint_path=self.checkpoint_path,
+                                checkpoint_every=250)
+
+    def resume(self, text, chunk_size=77):
+        """Replay the stream from the offset of its checkpoint and resume the sum."""
+        offset = self.calculator.stream_offset(self.checkpoint_path)
+        return self.calculator.resume_stream(chunked(text[offset:], chunk_size),
+                                             self.checkpoint_path)
+
+    def test_resume_gives_uninterrupted_result(self):
+        """Test that resuming a stream after a crash gives the same sum for every format."""
+        for input_format in INPUT_FORMATS:
+            spec = WorkloadSpec(input_format, num_tokens=3000, delimiter_length=3,
+                                over_limit_density=0.1, newline_density=0.05)
+            text = generate_workload(spec)
+            for batches in (4, 10, 20):
+                with self.subTest(input_format=input_format, batches=batches):
+                    self.crash_after(text, batches)
+                    self.assertGreater(self.calculator.stream_offset(self.checkpoint_path), 0)
+                    self.assertEqual(self.calculator.add(text), self.resume(text))
+                    self.assertFalse(os.path.exists(self.checkpoint_path))
+
+    def test_offset_is_at_a_delimiter_boundary(self):
+        """Test that the replay offset of a stream is the start of a delimiter."""
+        text = "//[€€]\n" + "€€".join(str(num % 1000) for num in range(2000))
+        self.crash_after(text, 10)
+        offset = self.calculator.stream_offset(self.checkpoint_path)
+        self.assertEqual("€€", text[offset:offset + 2])
+        self.assertEqual(self.calculator.add(text), self.resume(text))
+
+    def test_resume_reports_all_negative_numbers(self):
+        """Test that negative numbers found before the crash are still reported."""
+        text = "-1," + "1," * 500 + "-2,3"
+        self.crash_after(text, 3, chunk_size=50)
+        with self.assertRaises(ValueError) as context:
+            self.resume(text)
+        self.assertEqual("negative numbers not allowed: -1, -2", str(context.exception))
+
+    def test_file_checkpoint_is_not_resumed(self):
+        """Test that a checkpoint of a file or no checkpoint replays the whole stream."""
+        text = "1," * 2000 + "1"
+        self.assertEqual(0, self.calculator.stream_offset(self.checkpoint_path))
+        self.assertEqual(2001, self.resume(text))
+        Checkpoint(10, 42, '', '1', source_size=100, source_mtime_ns=1).save(self.checkpoint_path)
+        self.assertEqual(0, self.calculator.stream_offset(self.checkpoint_path))
+        self.assertEqual(2001, self.resume(text))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for compressed inputs.
+"""
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import threading
+import unittest
+
+from string_calculator.compression import compression_opener, iter_decompressed_chunks
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import WorkloadSpec, generate_workload
+
+CODECS = {'.gz': gzip, '.bz2': bz2, '.xz': lzma}
+
+
+class TestCompressedInputs(unittest.TestCase):
+    """Test cases for reading gzip, bz2 and xz inputs."""
+
+    def setUp(self):
+        """Set up a temporary directory, a calculator and an input for each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.calculator = StringCalculator()
+        self.input_str = generate_workload(WorkloadSpec('multiple', num_tokens=20000,
+                                                        delimiter_length=2,
+                                                        over_limit_density=0.1,
+                                                        newline_density=0.01))
+
+    def write(self, extension, contents=None):
+        """Write the input compressed with the codec of an extension."""
+        path = os.path.join(self.directory.name, 'input' + extension)
+        contents = self.input_str if contents is None else contents
+        with CODECS[extension].open(path, 'wt', encoding='utf-8', newline='') as output:
+            output.write(contents)
+        return path
+
+    def test_detection(self):
+        """Test that formats are detected from the file contents."""
+        for extension, codec in CODECS.items():
+            self.assertIs(codec.open, compression_opener(self.write(extension)))
+        plain = os.path.join(self.directory.name, 'input.txt')
+        with open(plain, 'w', encoding='utf-8') as output:
+            output.write("1,2")
+        self.assertIsNone(compression_opener(plain))
+
+    def test_add_file(self):
+        """Test that compressed files give the same sum as the plain input."""
+        expected = self.calculator.add(self.input_str)
+        for extension in CODECS:
+            path = self.write(extension)
+            self.assertEqual(expected, self.calculator.add_file(path, chunk_size=4096))
+            self.assertEqual(
+                self.calculator.aggregate(self.input_str, ['count', 'max']),
+                self.calculator.aggregate_file(path, ['count', 'max'], chunk_size=4096)
+            )
+
+    def test_checkpoints(self):
+        """Test that compressed files can be summed with checkpoints."""
+        path = self.write('.gz')
+        checkpoint_path = os.path.join(self.directory.name, 'checkpoint.json')
+        self.assertEqual(self.calculator.add(self.input_str),
+                         self.calculator.add_file(path, chunk_size=4096,
+                                                  checkpoint_path=checkpoint_path,
+                                                  checkpoint_every=8192))
+
+    def test_queue_is_bounded(self):
+        """Test that the producer does not read ahead of the bounded queue."""
+        path = self.write('.gz')
+        chunks = iter_decompressed_chunks(path, chunk_size=1024, queue_size=2)
+        next(chunks)
+        producers = [thread for thread in threading.enumerate()
+                     if thread.name.startswith('decompress')]
+        self.assertEqual(1, len(producers))
+        self.assertLessEqual(producers[0].chunks.qsize(), 2)
+        chunks.close()
+        producers[0].join(timeout=5)
+        self.assertFalse(producers[0].is_alive())
+
+    def test_corrupted_file(self):
+        """Test that decompression errors are raised to the consumer."""
+        path = self.write('.gz')
+        with open(path, 'r+b') as compressed:
+            compressed.seek(-12, os.SEEK_END)
+            compressed.write(b'\x00' * 12)
+        with self.assertRaises(Exception):
+            self.calculator.add_file(path)
+
+    def test_negative_numbers(self):
+        """Test that the calculator rules apply to compressed inputs."""
+        path = self.write('.xz', "//;\n1;-2\n3;-4")
+        with self.assertRaises(ValueError) as context:
+            self.calculator.add_file(path)
+        self.assertEqual("negative numbers not allowed: -2, -4", str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
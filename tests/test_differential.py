@@ -0,0 +1,65 @@
+"""
+Tests for the differential harness.
+"""
+import os
+import tempfile
+import unittest
+
+from string_calculator.differential import DifferentialHarness, evaluate
+from string_calculator.implementations import CompositeValidator, UpperLimitNumberValidator
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload, write_workload
+
+
+class TestDifferentialHarness(unittest.TestCase):
+    """Test cases for the DifferentialHarness class."""
+
+    def setUp(self):
+        """Set up the workloads shared by the tests."""
+        self.inputs = [
+            generate_workload(WorkloadSpec(input_format, num_tokens=100, negative_density=0.01,
+                                           over_limit_density=0.1, seed=seed))
+            for input_format in INPUT_FORMATS
+            for seed in range(3)
+        ]
+
+    def test_evaluate(self):
+        """Test that outcomes capture both sums and error messages."""
+        calculator = StringCalculator()
+        self.assertEqual((3, None), evaluate(calculator, "1,2"))
+        self.assertEqual(
+            (None, "ValueError: negative numbers not allowed: -1"),
+            evaluate(calculator, "-1,2")
+        )
+
+    def test_equivalent_candidate_has_no_mismatches(self):
+        """Test that an equivalent implementation is reported as such."""
+        harness = DifferentialHarness({'default': StringCalculator()})
+        self.assertEqual([], harness.run(self.inputs))
+
+    def test_different_validator_is_reported(self):
+        """Test that a candidate accepting negative numbers is reported."""
+        permissive = StringCalculator(validator=CompositeValidator([UpperLimitNumberValidator()]))
+        harness = DifferentialHarness({'permissive': permissive})
+        mismatches = harness.check("-1,2")
+        self.assertEqual(1, len(mismatches))
+        self.assertEqual('permissive', mismatches[0].candidate)
+        self.assertEqual((None, "ValueError: negative numbers not allowed: -1"),
+                         mismatches[0].expected)
+        self.assertEqual((1, None), mismatches[0].actual)
+
+    def test_run_file(self):
+        """Test that generated files are checked and reported by path."""
+        permissive = StringCalculator(validator=CompositeValidator([UpperLimitNumberValidator()]))
+        harness = DifferentialHarness({'default': StringCalculator(), 'permissive': permissive})
+        spec = WorkloadSpec('multiple', num_tokens=1000, negative_density=0.05)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            write_workload(path, spec)
+            mismatches = harness.run_file(path)
+        self.assertEqual(['permissive'], [mismatch.candidate for mismatch in mismatches])
+        self.assertEqual(path, mismatches[0].source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for the incrementally recomputed document.
+"""
+import random
+import unittest
+
+from string_calculator.differential import evaluate
+from string_calculator.document import IndexedDocument
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+
+class CountingDocument(IndexedDocument):
+    """Document counting how many segments it tokenizes."""
+
+    tokenized = 0
+
+    def _segment(self, text):
+        """Count the segment and tokenize it."""
+        self.tokenized += 1
+        return super()._segment(text)
+
+
+class TestIndexedDocument(unittest.TestCase):
+    """Test cases for the IndexedDocument class."""
+
+    def setUp(self):
+        """Set up the reference calculator for each test."""
+        self.calculator = StringCalculator()
+
+    def assertMatchesCalculator(self, document):
+        """Assert that a document has the sum or error of StringCalculator.add."""
+        try:
+            outcome = document.sum(), None
+        except ValueError as error:
+            outcome = None, f"ValueError: {error}"
+        self.assertEqual(evaluate(self.calculator, document.text), outcome)
+
+    def test_initial_sum(self):
+        """Test the sum of freshly parsed documents."""
+        self.assertEqual(0, IndexedDocument("").sum())
+        self.assertEqual(6, IndexedDocument("1\n2,3").sum())
+        self.assertEqual(3, IndexedDocument("//;\n1;2").sum())
+        self.assertEqual(6, IndexedDocument("//[***]\n1***2***3").sum())
+        self.assertEqual(6, IndexedDocument("//[*][%]\n1*2%3").sum())
+        self.assertEqual(2, IndexedDocument("2,1001").sum())
+
+    def test_edits(self):
+        """Test that edits return the new sum."""
+        document = IndexedDocument("1,2,3")
+        self.assertEqual(16, document.apply_edit(2, 1, "12"))
+        self.assertEqual("1,12,3", document.text)
+        self.assertEqual(4, document.apply_edit(1, 3, ""))
+        self.assertEqual(49, document.apply_edit(0, 0, "45,"))
+
+    def test_negative_numbers(self):
+        """Test that negative numbers are reported in document order."""
+        document = IndexedDocument("1,2,3,4")
+        with self.assertRaises(ValueError) as context:
+            document.apply_edit(6, 0, "-")
+        self.assertEqual("negative numbers not allowed: -4", str(context.exception))
+        with self.assertRaises(ValueError) as context:
+            document.apply_edit(0, 0, "-")
+        self.assertEqual("negative numbers not allowed: -1, -4", str(context.exception))
+        with self.assertRaises(ValueError):
+            document.apply_edit(0, 1, "")
+        self.assertEqual(10, document.apply_edit(6, 1, ""))
+
+    def test_long_delimiter_broken_and_restored(self):
+        """Test that edits breaking and recreating a long delimiter are handled."""
+        document = IndexedDocument("//[***]\n1***2***3")
+        with self.assertRaises(ValueError):
+            document.apply_edit(10, 1, "")
+        self.assertMatchesCalculator(document)
+        self.assertEqual(6, document.apply_edit(10, 0, "*"))
+        self.assertEqual(15, document.apply_edit(17, 0, "***9"))
+
+    def test_multiple_delimiters_created_by_edit(self):
+        """Test that an edit completing a multi-character delimiter is handled."""
+        document = IndexedDocument("//[**][%%]\n1**2%3")
+        self.assertMatchesCalculator(document)
+        self.assertEqual(6, document.apply_edit(15, 0, "%"))
+        self.assertEqual(10, document.apply_edit(18, 0, "**4"))
+        with self.assertRaises(ValueError):
+            document.apply_edit(12, 1, "")
+        self.assertEqual(10, document.apply_edit(12, 0, "*"))
+        self.assertEqual("//[**][%%]\n1**2%%3**4", document.text)
+
+    def test_header_edits(self):
+        """Test that edits of the header re-parse the document."""
+        document = IndexedDocument("//;\n1;2")
+        with self.assertRaises(ValueError):
+            document.apply_edit(2, 1, "|")
+        self.assertEqual(3, document.apply_edit(4, 3, "1|2"))
+        self.assertEqual(6, document.apply_edit(0, 4, "//[*][|]\n3*"))
+        document = IndexedDocument("/1,2")
+        with self.assertRaises(ValueError):
+            document.apply_edit(0, 0, "/")
+        self.assertMatchesCalculator(document)
+
+    def test_edits_are_local(self):
+        """Test that an edit only re-tokenizes the segments around it."""
+        spec = WorkloadSpec('multiple', num_tokens=20000, delimiter_length=2)
+        document = CountingDocument(generate_workload(spec))
+        text = document.text
+        delimiter = text[3:5]
+        middle = len(text) // 2
+        while not text[middle].isdigit():
+            middle += 1
+        document.tokenized = 0
+        document.apply_edit(middle, 1, "7")
+        document.apply_edit(middle + 1, 0, delimiter + "5")
+        with self.assertRaises(ValueError):
+            document.apply_edit(middle, 0, delimiter[0])
+        self.assertLess(document.tokenized, 20)
+        self.assertMatchesCalculator(document)
+
+    def test_crlf_edits_are_local(self):
+        """Test that documents with CRLF line endings are cut into segments too."""
+        document = CountingDocument("5\r\n" * 20000)
+        middle = 30000
+        document.tokenized = 0
+        self.assertEqual(100020, document.apply_edit(middle, 0, "2"))
+        self.assertEqual(99996, document.apply_edit(middle, 2, " 1 "))
+        self.assertLess(document.tokenized, 20)
+        self.assertMatchesCalculator(document)
+
+    def test_random_edits_match_calculator(self):
+        """Test that random edits always give the result of StringCalculator.add."""
+        rng = random.Random(0)
+        alphabet = "0123456789,\n-*%;#[]/"
+        for trial in range(40):
+            spec = WorkloadSpec(rng.choice(INPUT_FORMATS), num_tokens=rng.randint(0, 30),
+                                delimiter_length=rng.randint(1, 3), negative_density=0.05,
+                                over_limit_density=0.1, newline_density=0.1, seed=trial)
+            text = generate_workload(spec)
+            document = IndexedDocument(text)
+            for _ in range(30):
+                offset = rng.randint(0, len(text))
+                deleted_len = rng.randint(0, min(3, len(text) - offset))
+                inserted_text = "".join(rng.choice(alphabet + text[-5:])
+                                        for _ in range(rng.randint(0, 3)))
+                text = text[:offset] + inserted_text + text[offset + deleted_len:]
+                try:
+                    document.apply_edit(offset, deleted_len, inserted_text)
+                except ValueError:
+                    pass
+                self.assertEqual(text, document.text)
+                self.assertMatchesCalculator(document)
+
+    def test_edit_out_of_range(self):
+        """Test that edits outside of the document are rejected."""
+        with self.assertRaises(ValueError):
+            IndexedDocument("1,2").apply_edit(2, 5, "")
+
+
+if __name__ == "__main__":
+    unittest.main()
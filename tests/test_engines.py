@@ -0,0 +1,91 @@
+"""
+Tests for the execution engines.
+"""
+import unittest
+
+from string_calculator.engines import (
+    ENGINES,
+    PER_TOKEN,
+    parallel_sum,
+    scan_sum,
+    split_at_delimiters,
+    vectorized_sum
+)
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+
+class TestEngines(unittest.TestCase):
+    """Test cases for the engine functions."""
+
+    def test_scan_sum(self):
+        """Test the single-pass scanner."""
+        self.assertEqual(6, scan_sum("1,2,3", ','))
+        self.assertEqual(2, scan_sum("2,1001", ','))
+        self.assertEqual(0, scan_sum("", ','))
+
+    def test_vectorized_sum(self):
+        """Test the bulk builtin engine."""
+        self.assertEqual(6, vectorized_sum("1***2***3", '***'))
+        self.assertEqual(1002, vectorized_sum("2,1000,1001", ','))
+        self.assertEqual(0, vectorized_sum("", ','))
+
+    def test_negative_numbers_error(self):
+        """Test that every engine reports negative numbers in input order."""
+        for engine_sum in (scan_sum, vectorized_sum, parallel_sum):
+            with self.assertRaises(ValueError) as context:
+                engine_sum("-1,2,-3", ',')
+            self.assertEqual("negative numbers not allowed: -1, -3", str(context.exception))
+
+    def test_malformed_number_takes_precedence(self):
+        """Test that a malformed number is reported before negative numbers."""
+        for engine_sum in (scan_sum, vectorized_sum, parallel_sum):
+            with self.assertRaises(ValueError) as context:
+                engine_sum("-1,x", ',')
+            self.assertIn("invalid literal", str(context.exception))
+
+    def test_split_at_delimiters(self):
+        """Test that parts are cut after a delimiter and rejoin to the whole string."""
+        numbers_str = "1**22****333**4444**5"
+        chunks = split_at_delimiters(numbers_str, '**', 4)
+        self.assertEqual(numbers_str, "".join(chunks))
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks[:-1]:
+            self.assertTrue(chunk.endswith('**'))
+            self.assertTrue(chunk[-3].isdigit())
+
+    def test_parallel_sum(self):
+        """Test the multi-process engine against the scanner."""
+        numbers_str = ",".join(str(num) for num in range(2000))
+        self.assertEqual(scan_sum(numbers_str, ','), parallel_sum(numbers_str, ',', workers=2))
+
+
+class TestEnginesAgainstReference(unittest.TestCase):
+    """Check every engine against the per-token engine on generated workloads."""
+
+    def test_engines_match_per_token(self):
+        """Test that all engines give the same sum or error as the per-token engine."""
+        calculator = StringCalculator()
+        calculator.planner.profile.workers = 2
+        for input_format in INPUT_FORMATS:
+            for negative_density in (0.0, 0.01):
+                spec = WorkloadSpec(input_format, num_tokens=500, delimiter_length=2,
+                                    negative_density=negative_density, over_limit_density=0.2,
+                                    newline_density=0.1)
+                input_str = generate_workload(spec)
+                outcomes = set()
+                for engine in ENGINES:
+                    try:
+                        outcomes.add(calculator.run_engine(engine, input_str))
+                    except ValueError as error:
+                        outcomes.add(str(error))
+                self.assertEqual(1, len(outcomes), (input_format, negative_density, outcomes))
+
+    def test_per_token_is_reference(self):
+        """Test that the per-token engine is the plain parse, validate and filter path."""
+        calculator = StringCalculator()
+        self.assertEqual(6, calculator.run_engine(PER_TOKEN, "//[*][%]\n1*2%3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
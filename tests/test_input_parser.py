@@ -6,7 +6,9 @@ from string_calculator.implementations import (
     DefaultInputParser,
     StandardDelimiterStrategy,
     CustomDelimiterStrategy,
-    LongDelimiterStrategy
+    LongDelimiterStrategy,
+    MultipleDelimiterStrategy,
+    create_default_parser
 )
 
 
@@ -76,5 +78,13 @@ class TestDefaultInputParser(unittest.TestCase):
         self.assertEqual([1, 2, 3], result)
 
 
+    def test_create_default_parser(self):
+        """Test that the default parser has every delimiter strategy."""
+        parser = create_default_parser()
+        self.assertIsInstance(parser.multiple_delimiter_strategy, MultipleDelimiterStrategy)
+        self.assertEqual([1, 2, 3], parser.parse("//[*][%]\n1*2%3"))
+        self.assertEqual([1, 2, 3], parser.parse("//[***]\n1***2***3"))
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,236 @@
+"""
+Tests for the binary pre-tokenized cache.
+"""
+import gzip
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from string_calculator.compression import open_input
+from string_calculator.differential import evaluate
+from string_calculator.implementations import (
+    CompositeValidator,
+    NegativeNumberValidator,
+    UpperLimitNumberValidator
+)
+from string_calculator.packed import VERSION, PackedValues, build_sidecar, cached_sum, sidecar_path_for
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+
+class CountingReader:
+    """A file wrapper that counts the bytes read through it."""
+
+    def __init__(self, source, counts):
+        self.source = source
+        self.counts = counts
+
+    def read(self, size=-1):
+        data = self.source.read(size)
+        self.counts.append(len(data))
+        return data
+
+    def readline(self, size=-1):
+        line = self.source.readline(size)
+        self.counts.append(len(line))
+        return line
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.source.close()
+
+
+class TestPackedValues(unittest.TestCase):
+    """Test cases for packed sidecar files."""
+
+    def setUp(self):
+        """Set up a temporary directory and a calculator for each test."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.calculator = StringCalculator()
+
+    def write(self, contents, name='input.txt'):
+        """Write an input file in the temporary directory."""
+        path = os.path.join(self.directory.name, name)
+        with open(path, 'w', encoding='utf-8', newline='') as output:
+            output.write(contents)
+        return path
+
+    def packed_outcome(self, path, chunk_size=1 << 20):
+        """Build a sidecar and sum it, returning the sum or the error like evaluate."""
+        build_sidecar(path, chunk_size=chunk_size)
+        with PackedValues(sidecar_path_for(path)) as packed:
+            try:
+                return packed.sum(), None
+            except ValueError as error:
+                return None, f"ValueError: {error}"
+
+    def test_matches_add(self):
+        """Test that sidecar sums match StringCalculator.add for every input format."""
+        for input_format in INPUT_FORMATS:
+            for negative_density in (0.0, 0.01):
+                spec = WorkloadSpec(input_format, num_tokens=5000, delimiter_length=2,
+                                    negative_density=negative_density, over_limit_density=0.1,
+                                    newline_density=0.05, seed=3)
+                input_str = generate_workload(spec)
+                path = self.write(input_str)
+                self.assertEqual(evaluate(self.calculator, input_str),
+                                 self.packed_outcome(path, chunk_size=97))
+
+    def test_small_inputs(self):
+        """Test empty inputs and inputs with headers."""
+        for input_str in ("", "1", "//;\n", "//;\n1;2", "//[*][%]\n1*2%3", "-1,2,-3"):
+            self.assertEqual(evaluate(self.calculator, input_str),
+                             self.packed_outcome(self.write(input_str)))
+
+    def test_upper_limit_and_validator(self):
+        """Test that the upper limit and the validator are chosen when summing."""
+        path = self.write("1,999,1000,1001,5000")
+        with PackedValues(build_sidecar(path)) as packed:
+            self.assertEqual(5, len(packed))
+            self.assertEqual(2000, packed.sum())
+            self.assertEqual(1, packed.sum(upper_limit=1))
+            self.assertEqual(8001, packed.sum(upper_limit=10000))
+            validator = CompositeValidator([NegativeNumberValidator(), UpperLimitNumberValidator()])
+            self.assertEqual(2000, packed.sum(validator=validator))
+
+        path = self.write("4,-2,-9", 'negative.txt')
+        with PackedValues(build_sidecar(path)) as packed:
+            self.assertEqual([-2, -9], packed.negative_numbers())
+            with self.assertRaises(ValueError) as context:
+                packed.sum(validator=CompositeValidator([NegativeNumberValidator()]))
+            self.assertEqual("negative numbers not allowed: -2, -9", str(context.exception))
+            self.assertEqual(-7, packed.sum(validator=UpperLimitNumberValidator()))
+
+    def test_calculator_validator(self):
+        """Test that the default validator of StringCalculator is applied from the packed counts."""
+        path = self.write("4,2,2000")
+        with PackedValues(build_sidecar(path)) as packed, \
+                mock.patch.object(self.calculator.validator, 'validate', side_effect=AssertionError):
+            self.assertEqual(6, packed.sum(validator=self.calculator.validator))
+
+        path = self.write("4,-2,-9", 'negative.txt')
+        with PackedValues(build_sidecar(path)) as packed:
+            with self.assertRaises(ValueError) as context:
+                packed.sum(validator=self.calculator.validator)
+            self.assertEqual("negative numbers not allowed: -2, -9", str(context.exception))
+
+    def test_custom_validator_gets_a_list(self):
+        """Test that other validators receive the values as a list."""
+        received = []
+
+        class SortingValidator(NegativeNumberValidator):
+            def validate(self, numbers):
+                received.append(sorted(numbers + [0]))
+
+        path = self.write("4,2,2000")
+        with PackedValues(build_sidecar(path)) as packed:
+            validator = CompositeValidator([SortingValidator(), UpperLimitNumberValidator()])
+            self.assertEqual(6, packed.sum(validator=validator))
+        self.assertEqual([[0, 2, 4, 2000]], received)
+
+    def test_malformed_and_oversized_numbers(self):
+        """Test that inputs which cannot be packed are rejected without a sidecar."""
+        for input_str in ("1,x", str(1 << 63)):
+            path = self.write(input_str)
+            with self.assertRaises(ValueError):
+                build_sidecar(path)
+            self.assertFalse(os.path.exists(sidecar_path_for(path)))
+        self.assertEqual([], os.listdir(self.directory.name)[1:])
+
+    def test_compressed_input(self):
+        """Test that sidecars can be built from compressed inputs."""
+        input_str = generate_workload(WorkloadSpec('long', num_tokens=3000, delimiter_length=3))
+        path = os.path.join(self.directory.name, 'input.gz')
+        with gzip.open(path, 'wt', encoding='utf-8', newline='') as output:
+            output.write(input_str)
+        self.assertEqual(self.calculator.add(input_str), cached_sum(path))
+
+    def test_cached_sum_invalidation(self):
+        """Test that cached_sum rebuilds the sidecar when the input changes."""
+        path = self.write("1,2,3")
+        self.assertEqual(6, cached_sum(path))
+        sidecar = sidecar_path_for(path)
+        self.assertTrue(os.path.exists(sidecar))
+        with PackedValues(sidecar) as packed:
+            self.assertTrue(packed.is_fresh(path))
+            self.assertTrue(packed.is_fresh(path, verify_checksum=True))
+
+        self.write("1,2,4")
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        with PackedValues(sidecar) as packed:
+            self.assertFalse(packed.is_fresh(path))
+            self.assertFalse(packed.is_fresh(path, verify_checksum=True))
+        self.assertEqual(7, cached_sum(path, verify_checksum=True))
+        self.assertEqual(3, cached_sum(path, upper_limit=3))
+
+    def test_header_fingerprint(self):
+        """Test that the header fingerprint depends on the header line only."""
+        fingerprints = []
+        for input_str in ("//;\n1;2", "//;\n3;4", "//|\n1|2", "1,2"):
+            with PackedValues(build_sidecar(self.write(input_str))) as packed:
+                fingerprints.append(packed.header_fingerprint)
+        self.assertEqual(fingerprints[0], fingerprints[1])
+        self.assertEqual(3, len(set(fingerprints)))
+
+    def test_header_change_invalidates(self):
+        """Test that a new header line invalidates the sidecar even with the same size and mtime."""
+        path = self.write("//;\n1;2;3")
+        self.assertEqual(6, cached_sum(path))
+        stat = os.stat(path)
+        self.write("//|\n1;2;3")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        with PackedValues(sidecar_path_for(path)) as packed:
+            self.assertFalse(packed.is_fresh(path))
+        with self.assertRaises(ValueError):
+            cached_sum(path)
+
+    def test_is_fresh_reads_only_the_header(self):
+        """Test that checking a sidecar reads the header line and nothing past it."""
+        contents = {
+            'plain.txt': (','.join(['7'] * 100000), 2),
+            'header.txt': ("//;\n" + ';'.join(['7'] * 100000), 4),
+            'long_header.txt': ("//" + ';' * 100000 + "\n1", 2 + (1 << 16)),
+        }
+        for name, (text, expected) in contents.items():
+            with self.subTest(name=name):
+                path = self.write(text, name)
+                build_sidecar(path)
+                counts = []
+                with mock.patch('string_calculator.packed.open_input',
+                                lambda path: CountingReader(open_input(path), counts)):
+                    with PackedValues(sidecar_path_for(path)) as packed:
+                        self.assertTrue(packed.is_fresh(path))
+                self.assertEqual(expected, sum(counts))
+
+    def test_not_a_sidecar(self):
+        """Test that other files are rejected."""
+        with self.assertRaises(ValueError):
+            PackedValues(self.write("1,2,3"))
+
+    def test_unreadable_sidecar_is_rebuilt(self):
+        """Test that cached_sum rebuilds a sidecar of another version or a damaged one."""
+        path = self.write("1,2,3")
+        sidecar = sidecar_path_for(path)
+        for damage in (lambda data: data[:4] + struct.pack('=H', VERSION + 1) + data[6:],
+                       lambda data: b'XXXX' + data[4:],
+                       lambda data: data[:10],
+                       lambda data: data[:-4]):
+            with self.subTest(damage=damage):
+                build_sidecar(path)
+                with open(sidecar, 'rb') as source:
+                    data = source.read()
+                with open(sidecar, 'wb') as output:
+                    output.write(damage(data))
+                self.assertEqual(6, cached_sum(path))
+                with PackedValues(sidecar) as packed:
+                    self.assertTrue(packed.is_fresh(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
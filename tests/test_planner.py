@@ -0,0 +1,136 @@
+"""
+Tests for the engine planner and its calibration.
+"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from string_calculator.calibration import calibrate
+from string_calculator.engines import PARALLEL, PER_TOKEN, SCANNER, VECTORIZED
+from string_calculator.implementations import CompositeValidator, UpperLimitNumberValidator
+from string_calculator.planner import PROFILE_ENV_VAR, CalibrationProfile, EnginePlanner
+from string_calculator.string_calculator import StringCalculator
+
+
+class TestEnginePlanner(unittest.TestCase):
+    """Test cases for the EnginePlanner class."""
+
+    def setUp(self):
+        """Set up a planner with known thresholds for each test."""
+        self.profile = CalibrationProfile(scanner_threshold=10, vectorized_threshold=100,
+                                          parallel_threshold=1000, workers=2)
+        self.planner = EnginePlanner(self.profile)
+
+    def test_plan_by_size(self):
+        """Test that the engine is chosen from the input size."""
+        self.assertEqual(PER_TOKEN, self.planner.plan(5))
+        self.assertEqual(SCANNER, self.planner.plan(10))
+        self.assertEqual(VECTORIZED, self.planner.plan(999))
+        self.assertEqual(PARALLEL, self.planner.plan(10 ** 9))
+
+    def test_plan_by_format(self):
+        """Test that input formats can have their own thresholds."""
+        self.profile.format_thresholds = {'multiple': {'scanner_threshold': None,
+                                                       'vectorized_threshold': 50}}
+        self.assertEqual(SCANNER, self.planner.plan(50))
+        self.assertEqual(SCANNER, self.planner.plan(50, 'custom'))
+        self.assertEqual(PER_TOKEN, self.planner.plan(49, 'multiple'))
+        self.assertEqual(VECTORIZED, self.planner.plan(50, 'multiple'))
+        self.assertEqual(PARALLEL, self.planner.plan(1000, 'multiple'))
+
+    def test_calculator_plans_the_numbers(self):
+        """Test that the calculator plans from the format and the numbers after the header."""
+        self.profile.format_thresholds = {'multiple': {'scanner_threshold': 20}}
+        calculator = StringCalculator(planner=self.planner)
+        self.assertEqual(SCANNER, calculator.plan("1,2,3,4,5,6"))
+        self.assertEqual(PER_TOKEN, calculator.plan("//[***]\n1***2"))
+        self.assertEqual(SCANNER, calculator.plan("//[***]\n1***2***3***4"))
+        self.assertEqual(PER_TOKEN, calculator.plan("//[*][%]\n1*2%3*4%5*6%7*8%9"))
+        self.assertEqual(SCANNER, calculator.plan("//[*][%]\n1*2%3*4%5*6%7*8%9*10%11"))
+        self.assertEqual(PER_TOKEN, calculator.plan("//;\n1;2"))
+
+    def test_disabled_engines(self):
+        """Test that engines without a threshold are never chosen."""
+        planner = EnginePlanner(CalibrationProfile(None, 100, None))
+        self.assertEqual(PER_TOKEN, planner.plan(99))
+        self.assertEqual(VECTORIZED, planner.plan(10 ** 9))
+
+    def test_calculator_records_engines(self):
+        """Test that the chosen engines are visible through the planner."""
+        seen = []
+        self.planner.listener = lambda engine, size: seen.append((engine, size))
+        calculator = StringCalculator(planner=self.planner)
+        self.assertEqual(3, calculator.add("1,2"))
+        self.assertEqual(55, calculator.add("1,2,3,4,5,6,7,8,9,10"))
+        self.assertEqual({PER_TOKEN: 1, SCANNER: 1}, self.planner.counts)
+        self.assertEqual([(PER_TOKEN, 3), (SCANNER, 20)], seen)
+
+    def test_custom_rules_use_per_token_engine(self):
+        """Test that non-default parsers or validators always run per token."""
+        permissive = StringCalculator(
+            validator=CompositeValidator([UpperLimitNumberValidator()]), planner=self.planner
+        )
+        self.assertEqual(PER_TOKEN, permissive.plan("-1," * 1000))
+        self.assertEqual(-1000, permissive.add("-1," * 1000))
+
+    def test_digit_delimiters_run_in_parallel(self):
+        """Test that inputs whose delimiters contain digits are cut correctly in parallel."""
+        calculator = StringCalculator(planner=self.planner)
+        calculator.planner.profile.workers = 2
+        self.assertEqual(PARALLEL, calculator.plan("//[;]\n" + "1;" * 1000))
+        input_str = "//[0]\n" + "102" * 1000
+        self.assertEqual(PARALLEL, calculator.plan(input_str))
+        self.assertEqual(sum(num for num in calculator.parser.parse(input_str) if num <= 1000),
+                         calculator.add(input_str))
+
+
+class TestCalibrationProfile(unittest.TestCase):
+    """Test cases for saving, loading and calibrating profiles."""
+
+    def test_save_and_load(self):
+        """Test that a saved profile is loaded back."""
+        profile = CalibrationProfile(1, 2, None, 3, {'multiple': {'scanner_threshold': 4}})
+        with tempfile.TemporaryDirectory() as directory:
+            path = profile.save(os.path.join(directory, 'profile.json'))
+            self.assertEqual(profile.to_dict(), CalibrationProfile.load(path).to_dict())
+
+    def test_missing_profile_uses_defaults(self):
+        """Test that the default thresholds apply without a saved profile."""
+        with tempfile.TemporaryDirectory() as directory:
+            profile = CalibrationProfile.load(os.path.join(directory, 'missing.json'))
+        self.assertEqual(CalibrationProfile().to_dict(), profile.to_dict())
+
+    def test_malformed_profiles_use_defaults(self):
+        """Test that a broken profile file never breaks the calculator."""
+        defaults = CalibrationProfile().to_dict()
+        contents = {
+            '{"scanner_threshold": 1, "extra": 2}': dict(defaults, scanner_threshold=1),
+            '{"scanner_threshold": 1, "vectorized': defaults,
+            '[1, 2]': defaults,
+            '{"workers": 0, "parallel_threshold": "big"}': defaults,
+            '{"format_thresholds": [1]}': defaults,
+            '{"format_thresholds": {"long": {"scanner_threshold": "x", "vectorized_threshold": 9},'
+            ' "multiple": 3}}': dict(defaults, format_thresholds={'long': {'vectorized_threshold': 9}}),
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            for index, (content, expected) in enumerate(contents.items()):
+                path = os.path.join(directory, f'profile{index}.json')
+                with open(path, 'w', encoding='utf-8') as profile_file:
+                    profile_file.write(content)
+                self.assertEqual(expected, CalibrationProfile.load(path).to_dict())
+                with mock.patch.dict(os.environ, {PROFILE_ENV_VAR: path}):
+                    self.assertEqual(3, StringCalculator().add("1,2"))
+
+    def test_calibrate(self):
+        """Test that calibration writes a loadable profile."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.json')
+            profile = calibrate(sizes=(16, 256), workers=1, path=path)
+            self.assertEqual(profile.to_dict(), CalibrationProfile.load(path).to_dict())
+        self.assertIsNone(profile.parallel_threshold)
+        self.assertEqual({'custom', 'long', 'multiple'}, set(profile.format_thresholds))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the streaming tokenizer.
+"""
+import unittest
+
+from string_calculator.differential import evaluate
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.streaming import StreamTokenizer, iter_numbers
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+
+def chunked(input_str, size):
+    """Split a string into chunks of the given size."""
+    return [input_str[start:start + size] for start in range(0, len(input_str), size)]
+
+
+class TestStreamTokenizer(unittest.TestCase):
+    """Test cases for the StreamTokenizer class."""
+
+    def setUp(self):
+        """Set up the default parser for each test."""
+        self.parser = StringCalculator().parser
+
+    def parse_in_chunks(self, input_str, size):
+        """Parse an input fed in chunks of the given size."""
+        return [num for numbers in iter_numbers(self.parser, chunked(input_str, size))
+                for num in numbers]
+
+    def test_matches_parser_on_every_chunk_size(self):
+        """Test that numbers split across chunks are parsed as in the whole input."""
+        inputs = [
+            "1,2,3", "1\n2,3", "//;\n1;2\n3", "//[***]\n1***22***333", "//[**][%%]\n1**2%%3\n4",
+            "-1,2,-3", "", "1", "//[*][%]\n",
+        ]
+        for input_str in inputs:
+            for size in range(1, len(input_str) + 2):
+                self.assertEqual(self.parser.parse(input_str), self.parse_in_chunks(input_str, size),
+                                 (input_str, size))
+
+    def test_matches_parser_on_generated_workloads(self):
+        """Test that generated workloads of every format stream correctly."""
+        for input_format in INPUT_FORMATS:
+            spec = WorkloadSpec(input_format, num_tokens=2000, negative_density=0.05,
+                                delimiter_length=3, newline_density=0.05)
+            input_str = generate_workload(spec)
+            for size in (7, 64, 1000):
+                self.assertEqual(self.parser.parse(input_str), self.parse_in_chunks(input_str, size))
+
+    def test_pending_holds_only_the_last_number(self):
+        """Test that the tokenizer does not keep parsed text."""
+        tokenizer = StreamTokenizer(self.parser)
+        self.assertEqual([], tokenizer.feed("//[***]\n12"))
+        self.assertEqual([12, 34], tokenizer.feed("***34***5"))
+        self.assertEqual("***5", tokenizer.pending)
+        self.assertEqual([5], tokenizer.close())
+
+    def test_digit_delimiters(self):
+        """Test that delimiters containing digits are only cut after other characters."""
+        for input_str in ("//[0]\n102030", "//[0]\n1020304", "//[1]\n21312"):
+            for size in (1, 2, 3):
+                self.assertEqual(self.parser.parse(input_str), self.parse_in_chunks(input_str, size))
+
+    def test_crlf_and_padded_numbers(self):
+        """Test that CRLF line endings and padded numbers stream with bounded pending text."""
+        for input_str in ("5\r\n" * 2000, " 5 , 6 \r\n" * 1000, "//;\n" + "5\r\n6 ;7\r\n" * 500):
+            tokenizer = StreamTokenizer(self.parser)
+            numbers = []
+            for start in range(0, len(input_str), 64):
+                numbers += tokenizer.feed(input_str[start:start + 64])
+                self.assertLess(len(tokenizer.pending), 64)
+            numbers += tokenizer.close()
+            self.assertEqual(self.parser.parse(input_str), numbers)
+
+
+    def test_errors_match_add(self):
+        """Test that invalid inputs raise the error of add, whatever the chunk size."""
+        calculator = StringCalculator()
+        inputs = ["//\n", "//-\n800958093;08243]3[9799,37744", "//;\n1;x;[", "//;\n1;x\n2",
+                  "//[*]\n1*2[3", "1,x,2\n3"]
+        for input_str in inputs:
+            for size in range(1, len(input_str) + 1):
+                try:
+                    outcome = calculator.add_stream(chunked(input_str, size)), None
+                except ValueError as error:
+                    outcome = None, f"ValueError: {error}"
+                self.assertEqual(evaluate(calculator, input_str), outcome, (input_str, size))
+
+    def test_brackets_changing_the_strategy(self):
+        """Test that brackets in the body changing the strategy after a cut are rejected."""
+        input_str = "//;\n1;2;3;4;[];5"
+        with self.assertRaises(ValueError):
+            StringCalculator().add(input_str)
+        with self.assertRaises(ValueError) as context:
+            StringCalculator().add_stream(chunked(input_str, 4))
+        self.assertEqual("square brackets in the numbers change the delimiters of the header",
+                         str(context.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
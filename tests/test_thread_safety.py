@@ -0,0 +1,90 @@
+"""
+Stress tests for sharing calculators between threads.
+"""
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from string_calculator.differential import evaluate
+from string_calculator.engines import parallel_sum, scan_sum
+from string_calculator.planner import CalibrationProfile, EnginePlanner
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import INPUT_FORMATS, WorkloadSpec, generate_workload
+
+
+def fields_of(instance):
+    """Snapshot the attributes of an object, identifying referenced objects by id."""
+    def snapshot(value):
+        if isinstance(value, (int, float, str, type(None))):
+            return value
+        if isinstance(value, list):
+            return [snapshot(item) for item in value]
+        return id(value)
+    return {key: snapshot(value) for key, value in vars(instance).items()}
+
+
+def state_of(calculator):
+    """Snapshot the state of a calculator and all of its dependencies."""
+    state = {
+        'calculator': fields_of(calculator),
+        'parser': fields_of(calculator.parser),
+        'validator': fields_of(calculator.validator),
+        'profile': calculator.planner.profile.to_dict(),
+    }
+    for strategy in vars(calculator.parser).values():
+        state[type(strategy).__name__] = fields_of(strategy)
+    for validator in calculator.validator.validators:
+        state[type(validator).__name__] = fields_of(validator)
+    return state
+
+
+class TestThreadSafety(unittest.TestCase):
+    """Test cases for concurrent use of a single StringCalculator."""
+
+    def setUp(self):
+        """Set up a shared calculator and inputs that exercise every engine and format."""
+        profile = CalibrationProfile(scanner_threshold=32, vectorized_threshold=512)
+        self.calculator = StringCalculator(planner=EnginePlanner(profile))
+        self.inputs = [
+            generate_workload(WorkloadSpec(input_format, num_tokens=num_tokens,
+                                           negative_density=negative_density,
+                                           over_limit_density=0.1, seed=seed))
+            for input_format in INPUT_FORMATS
+            for num_tokens in (1, 20, 400)
+            for negative_density in (0.0, 0.02)
+            for seed in range(4)
+        ]
+
+    def test_concurrent_results_match_sequential_results(self):
+        """Test that many threads sharing a calculator get the sequential outcomes."""
+        expected = [evaluate(StringCalculator(), input_str) for input_str in self.inputs]
+        before = state_of(self.calculator)
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            for _ in range(5):
+                outcomes = list(executor.map(lambda input_str: evaluate(self.calculator, input_str),
+                                             self.inputs * 4))
+                self.assertEqual(expected * 4, outcomes)
+
+        self.assertEqual(before, state_of(self.calculator))
+        self.assertEqual(len(self.inputs) * 20, sum(self.calculator.planner.counts.values()))
+
+    def test_add_many(self):
+        """Test that add_many keeps the input order."""
+        inputs = [",".join(["1"] * count) for count in range(200)]
+        self.assertEqual(list(range(200)), self.calculator.add_many(inputs, max_workers=8))
+
+    def test_add_many_raises_first_error(self):
+        """Test that add_many reports the first failing input."""
+        with self.assertRaises(ValueError) as context:
+            self.calculator.add_many(["1", "-2", "-3"], max_workers=3)
+        self.assertEqual("negative numbers not allowed: -2", str(context.exception))
+
+    def test_threaded_parallel_sum(self):
+        """Test the threaded mode of the parallel engine."""
+        numbers_str = ",".join(str(num) for num in range(5000))
+        self.assertEqual(scan_sum(numbers_str, ','),
+                         parallel_sum(numbers_str, ',', workers=4, use_threads=True))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Tests for the synthetic workload generator.
+"""
+import os
+import tempfile
+import unittest
+
+from string_calculator.string_calculator import StringCalculator
+from string_calculator.workload import (
+    INPUT_FORMATS,
+    WorkloadSpec,
+    generate_workload,
+    iter_workload,
+    write_workload
+)
+
+
+class TestWorkloadGenerator(unittest.TestCase):
+    """Test cases for the workload generator."""
+
+    def setUp(self):
+        """Set up a new StringCalculator instance for each test."""
+        self.calculator = StringCalculator()
+
+    def test_generation_is_deterministic(self):
+        """Test that the same specification always produces the same input."""
+        spec = WorkloadSpec('multiple', num_tokens=500, newline_density=0.1, seed=7)
+        self.assertEqual(generate_workload(spec), generate_workload(spec))
+
+    def test_every_format_is_parseable(self):
+        """Test that every format produces input the calculator accepts."""
+        for input_format in INPUT_FORMATS:
+            spec = WorkloadSpec(input_format, num_tokens=200, delimiter_length=3,
+                                over_limit_density=0.2, newline_density=0.1, seed=3)
+            input_str = generate_workload(spec)
+            self.assertEqual(200, len(self.calculator.parser.parse(input_str)))
+            self.assertIsInstance(self.calculator.add(input_str), int)
+
+    def test_headers(self):
+        """Test that each format starts with the matching delimiter header."""
+        self.assertFalse(generate_workload(WorkloadSpec('default', 5)).startswith('//'))
+        custom = generate_workload(WorkloadSpec('custom', 5))
+        self.assertEqual('\n', custom[3])
+        long_header = generate_workload(WorkloadSpec('long', 5, delimiter_length=3)).split('\n')[0]
+        self.assertRegex(long_header, r'^//\[(.)\1\1\]$')
+        multiple_header = generate_workload(WorkloadSpec('multiple', 5, delimiter_count=4))
+        self.assertEqual(4, multiple_header.split('\n')[0].count('['))
+
+    def test_densities(self):
+        """Test that negative and over-limit densities are honoured."""
+        spec = WorkloadSpec(num_tokens=1000, over_limit_density=1.0, token_length=5)
+        self.assertEqual(0, self.calculator.add(generate_workload(spec)))
+
+        spec = WorkloadSpec(num_tokens=1000, negative_density=0.5)
+        numbers = self.calculator.parser.parse(generate_workload(spec))
+        negatives = len([num for num in numbers if num < 0])
+        self.assertTrue(400 < negatives < 600)
+
+    def test_chunks_concatenate_to_whole_input(self):
+        """Test that streamed chunks form the same input as whole generation."""
+        spec = WorkloadSpec('long', num_tokens=1000, seed=11)
+        chunks = list(iter_workload(spec, chunk_tokens=64))
+        self.assertGreater(len(chunks), 10)
+        self.assertEqual(generate_workload(spec), "".join(chunks))
+
+    def test_write_workload(self):
+        """Test that a workload can be streamed to disk."""
+        spec = WorkloadSpec('custom', num_tokens=300, newline_density=0.5, seed=5)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'input.txt')
+            written = write_workload(path, spec, chunk_tokens=32)
+            with open(path, encoding='utf-8', newline='') as input_file:
+                contents = input_file.read()
+        self.assertEqual(len(contents), written)
+        self.assertEqual(generate_workload(spec), contents)
+
+    def test_invalid_spec(self):
+        """Test that impossible specifications are rejected."""
+        with self.assertRaises(ValueError):
+            WorkloadSpec('unknown')
+        with self.assertRaises(ValueError):
+            WorkloadSpec('multiple', delimiter_count=1)
+        with self.assertRaises(ValueError):
+            WorkloadSpec(negative_density=0.6, over_limit_density=0.6)
+
+
+if __name__ == "__main__":
+    unittest.main()